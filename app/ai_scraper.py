@@ -6,14 +6,24 @@ It's designed to work with any job board and requires a valid OpenAI API key.
 """
 
 import os
+import asyncio
+import hashlib
 import logging
+import re
+import time
 import requests
-from bs4 import BeautifulSoup
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from typing import Dict, Any, List, Optional
+from collections import deque
+from contextlib import asynccontextmanager
 from datetime import datetime
 import json
 from urllib.parse import urlparse
 
+from .scrape_cache import scrape_cache
+
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv
@@ -21,10 +31,291 @@ try:
 except ImportError:
     pass
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Prefer selectolax (C-backed, much faster than BeautifulSoup) when available;
+# the Lexbor engine is the faster of its two backends
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
 logger = logging.getLogger(__name__)
 
+# orjson parses JSON ~2-5x faster than stdlib; fall back transparently
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+def _extract_json_object(text: str) -> Optional[str]:
+    """
+    Return the first balanced JSON object in text, or None.
+
+    Handles responses where the model wraps the JSON in prose or a markdown
+    fence, which a plain startswith/endswith check misses.
+    """
+    start = text.find('{')
+    if start == -1:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+def _find_job_posting(data: Any) -> Optional[Dict[str, Any]]:
+    """Recursively search parsed JSON-LD for a schema.org JobPosting object."""
+    if isinstance(data, dict):
+        type_field = data.get('@type')
+        if type_field == 'JobPosting' or (isinstance(type_field, list) and 'JobPosting' in type_field):
+            return data
+        for value in data.values():
+            found = _find_job_posting(value)
+            if found:
+                return found
+    elif isinstance(data, list):
+        for item in data:
+            found = _find_job_posting(item)
+            if found:
+                return found
+    return None
+
+
+# Model used for extraction; part of the result cache key so cached entries
+# are invalidated when the model or prompt changes
+OPENAI_MODEL = "gpt-4o-mini"
+_PROMPT_VERSION = "2"
+
+# tiktoken lets us truncate prompts by exact token count instead of characters
+try:
+    import tiktoken
+    try:
+        _ENCODER = tiktoken.encoding_for_model(OPENAI_MODEL)
+    except KeyError:
+        _ENCODER = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENCODER = None
+
+# System message carries the extraction rules once; the user message only
+# carries the schema and the posting text, keeping per-call prompt tokens low
+EXTRACTION_SYSTEM_MESSAGE = (
+    "You are a precise job posting analyzer. Extract ONLY information explicitly "
+    "stated in the posting text. Never infer, assume, or generate information that "
+    "isn't directly mentioned — no invented salaries, benefits, requirements, or "
+    "experience levels. Set any field that cannot be determined to null. "
+    "Respond with a single valid JSON object."
+)
+
+# Cache TTLs: job pages are near-static for hours, extraction results for longer
+HTML_CACHE_TTL = 6 * 3600
+RESULT_CACHE_TTL = 24 * 3600
+
+# Stop reading page bodies after this many characters; anything past this gets
+# truncated before the AI call anyway
+MAX_FETCH_SIZE = 2_000_000
+FETCH_CHUNK_SIZE = 65536
+
+# Token budget for the job posting text inside the prompt; keep the head
+# (title, company, description) plus the tail (salary/benefits often last)
+MAX_PROMPT_TOKENS = 3000
+_HEAD_TOKENS = 2400
+_TAIL_TOKENS = 600
+
+# Map-reduce extraction: pages over the prompt budget are split into windows
+# of this many tokens and extracted in parallel instead of being truncated
+MAP_CHUNK_TOKENS = 2000
+
+# How many postings scrape_many packs into one chat completion; beyond this
+# the per-posting share of the prompt budget gets too thin
+SCRAPE_BATCH_SIZE = 5
+
+# Common job posting content selectors, tried in order of specificity
+CONTENT_SELECTORS = (
+    '[class*="job-description"]',
+    '[class*="description"]',
+    '[class*="content"]',
+    '[class*="posting"]',
+    'main',
+    'article',
+    '.content',
+    '#content',
+    '.job-content',
+    '.posting-content',
+)
+
+# Precompiled at import time so the per-request hot path avoids rebuilding them
+_MAIN_SELECTOR = ', '.join(CONTENT_SELECTORS)
+
+# The bs4 fallback scans for the content container with find() and this
+# precompiled class predicate instead of running ~10 CSS selector traversals
+_CONTENT_CLASS_RE = re.compile(
+    r'job-description|description|posting-content|job-content|posting|content'
+)
+
+# Prefer the C-backed lxml parser for the bs4 fallback; html.parser keeps
+# things working when lxml is missing, just slower
+try:
+    import lxml  # noqa: F401
+    _BS_PARSER = 'lxml'
+except ImportError:
+    _BS_PARSER = 'html.parser'
+
+# Only content-bearing tags need to enter the fallback parse tree
+_BS4_STRAINER = SoupStrainer(
+    ['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'div', 'li',
+     'article', 'main', 'section']
+)
+_HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+_HEADING_TAG_SET = frozenset(_HEADING_TAGS)
+_HEADING_SELECTOR = ', '.join(_HEADING_TAGS)
+_WS_RE = re.compile(r'\s+')
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Cheap pre-check for text that plausibly is a job posting; 404 pages, login
+# walls and captchas fail it, saving the OpenAI round-trip
+_JOB_HINT_RE = re.compile(
+    r'\b(responsibilities|qualifications|requirements|experience|apply|salary)\b',
+    re.IGNORECASE,
+)
+_MIN_POSTING_CHARS = 400
+
+# Browser-like headers shared by the sync and async HTTP clients
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Shared OpenAI clients; constructing a client builds a fresh httpx connection
+# pool, so per-call construction throws away keep-alive connections
+_openai_client = None
+_async_openai_client = None
+
+
+def _get_openai_client(api_key: str):
+    """Get or lazily create the shared sync OpenAI client."""
+    global _openai_client
+    if _openai_client is None:
+        from openai import OpenAI
+        _openai_client = OpenAI(api_key=api_key, max_retries=2, timeout=30)
+    return _openai_client
+
+
+def _get_async_openai_client(api_key: str):
+    """Get or lazily create the shared async OpenAI client."""
+    global _async_openai_client
+    if _async_openai_client is None:
+        from openai import AsyncOpenAI
+        _async_openai_client = AsyncOpenAI(api_key=api_key, max_retries=2, timeout=30)
+    return _async_openai_client
+
+
+def _build_http_session() -> requests.Session:
+    """Build the shared requests session with retries and a large keep-alive pool."""
+    session = requests.Session()
+    # Use more realistic headers to avoid being blocked
+    session.headers.update(DEFAULT_HEADERS)
+    # Retry transient failures (429/5xx, connection resets) with backoff
+    # instead of failing the whole scrape on the first hiccup
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=50, pool_maxsize=50)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# One session per process so every AIScraper instance shares the same
+# keep-alive connection pool
+_http_session = _build_http_session()
+
+class _HostRateLimiter:
+    """
+    Cap concurrent requests and request rate per host so bulk scrapes don't
+    trigger 429 storms or per-IP blocks, while different hosts still proceed
+    in parallel.
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_per_second: int = 5):
+        self.max_concurrency = max_concurrency
+        self.max_per_second = max_per_second
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._recent: Dict[str, deque] = {}
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        sem = self._semaphores.get(host)
+        if sem is None:
+            sem = self._semaphores[host] = asyncio.Semaphore(self.max_concurrency)
+        return sem
+
+    @asynccontextmanager
+    async def limit(self, host: str):
+        async with self._semaphore(host):
+            # Token-bucket style: at most max_per_second starts per sliding second
+            recent = self._recent.setdefault(host, deque())
+            now = time.monotonic()
+            while recent and now - recent[0] > 1.0:
+                recent.popleft()
+            if len(recent) >= self.max_per_second:
+                await asyncio.sleep(1.0 - (now - recent[0]))
+            recent.append(time.monotonic())
+            yield
+
+
+# One limiter per process, shared by all async fetches
+_rate_limiter = _HostRateLimiter()
+
+# In-flight async scrapes keyed by URL; concurrent requests for the same
+# posting share one fetch + AI call (single-flight)
+_inflight: Dict[str, asyncio.Future] = {}
+
+# Shared aiohttp session for concurrent scraping (created lazily so importing
+# this module doesn't require a running event loop)
+_aiohttp_session = None
+
+
+async def _session():
+    """Get or lazily create the shared aiohttp session."""
+    global _aiohttp_session
+    import aiohttp
+
+    if _aiohttp_session is None or _aiohttp_session.closed:
+        connector = aiohttp.TCPConnector(limit=50, limit_per_host=4, ttl_dns_cache=300)
+        _aiohttp_session = aiohttp.ClientSession(
+            connector=connector,
+            headers=DEFAULT_HEADERS
+        )
+    return _aiohttp_session
+
 
 class AIScraper:
     """
@@ -33,25 +324,16 @@ class AIScraper:
     
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
-        self.session = requests.Session()
-        # Use more realistic headers to avoid being blocked
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
+        self.session = _http_session
     
-    def scrape_job_details(self, url: str) -> Dict[str, Any]:
+    def scrape_job_details(self, url: str, refresh: bool = False) -> Dict[str, Any]:
         """
         Main method to scrape job details from any job posting URL using AI.
-        
+
         Args:
             url (str): The job posting URL
-            
+            refresh (bool): If True, bypass the cache and re-scrape
+
         Returns:
             Dict[str, Any]: Scraped job details or error information
         """
@@ -63,7 +345,7 @@ class AIScraper:
                     'error': 'Invalid URL format',
                     'url': url
                 }
-            
+
             # Check if OpenAI API key is available
             if not self.api_key:
                 return {
@@ -71,258 +353,1071 @@ class AIScraper:
                     'error': 'OpenAI API key not found. Please set OPENAI_API_KEY environment variable.',
                     'url': url
                 }
-            
+
+            # Return a cached extraction if we scraped this URL recently
+            result_key = self._result_cache_key(url)
+            if not refresh:
+                cached = scrape_cache.get(result_key)
+                if cached:
+                    logger.info("Returning cached job details for %s", url)
+                    return _json_loads(cached)
+
             # Fetch the webpage content
-            html_content = self._fetch_webpage(url)
+            html_content = self._fetch_webpage(url, refresh=refresh)
             if not html_content:
                 return {
                     'success': False,
                     'error': 'Failed to fetch job page content',
                     'url': url
                 }
+
+            # Cheapest tier first: many boards embed a schema.org JobPosting
+            # with exactly the fields we'd otherwise ask the AI for
+            job_details = self._extract_structured(html_content, url)
+            if job_details:
+                scrape_cache.set(result_key, json.dumps(job_details), RESULT_CACHE_TTL)
+                return job_details
             
             # Extract text content from HTML
             text_content = self._extract_text_content(html_content)
             
             # Log content length for debugging
-            logger.info(f"Extracted text content length: {len(text_content)} characters")
+            logger.info("Extracted text content length: %d characters", len(text_content))
             if len(text_content) < 100:
-                logger.warning(f"Very short content extracted. First 200 chars: {text_content[:200]}")
+                logger.warning("Very short content extracted. First 200 chars: %s", text_content[:200])
                 return {
                     'success': False,
                     'error': 'Unable to scrape job details. This could be due to: (1) The website blocking automated access, (2) JavaScript-heavy content, or (3) Login requirements. Please copy and paste the job details manually.',
                     'url': url
                 }
-            else:
-                logger.info(f"Content preview: {text_content[:200]}...")
+            elif logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Content preview: %s...", text_content[:200])
             
+            # Don't pay for the AI call when the text clearly isn't a posting
+            if not self._looks_like_job_posting(text_content):
+                return {
+                    'success': False,
+                    'error': 'Page content does not look like a job posting. The URL may point to a login page, an expired posting, or a blocked page.',
+                    'url': url
+                }
+
             # Use AI to extract job details
             job_details = self._extract_with_ai(text_content, url)
-            
+
+            # Only cache successful extractions so errors aren't pinned
+            if job_details.get('success'):
+                scrape_cache.set(result_key, json.dumps(job_details), RESULT_CACHE_TTL)
+
             return job_details
-            
+
         except Exception as e:
-            logger.error(f"Error scraping job details from {url}: {str(e)}")
+            logger.error("Error scraping job details from %s: %s", url, e)
             return {
                 'success': False,
                 'error': f'Scraping failed: {str(e)}',
                 'url': url
             }
-    
+
+    async def scrape_job_details_async(self, url: str, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Async version of scrape_job_details, suitable for concurrent scraping.
+
+        Concurrent calls for the same URL are deduplicated: the second caller
+        awaits the first scrape's result instead of firing a duplicate fetch
+        and OpenAI call.
+
+        Args:
+            url (str): The job posting URL
+            refresh (bool): If True, bypass the cache and re-scrape
+
+        Returns:
+            Dict[str, Any]: Scraped job details or error information
+        """
+        existing = _inflight.get(url)
+        if existing is not None:
+            return await existing
+
+        future = asyncio.get_event_loop().create_future()
+        _inflight[url] = future
+        try:
+            result = await self._do_scrape_async(url, refresh=refresh)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            _inflight.pop(url, None)
+            # CancelledError is a BaseException, so cancellation skips the
+            # except arm above; make sure waiters piggybacked on this future
+            # are released rather than left awaiting forever
+            if not future.done():
+                future.cancel()
+
+    async def _do_scrape_async(self, url: str, refresh: bool = False) -> Dict[str, Any]:
+        """The actual async scrape pipeline behind the single-flight wrapper."""
+        try:
+            # Validate URL
+            if not self._is_valid_url(url):
+                return {
+                    'success': False,
+                    'error': 'Invalid URL format',
+                    'url': url
+                }
+
+            # Check if OpenAI API key is available
+            if not self.api_key:
+                return {
+                    'success': False,
+                    'error': 'OpenAI API key not found. Please set OPENAI_API_KEY environment variable.',
+                    'url': url
+                }
+
+            # Return a cached extraction if we scraped this URL recently
+            result_key = self._result_cache_key(url)
+            if not refresh:
+                cached = scrape_cache.get(result_key)
+                if cached:
+                    logger.info("Returning cached job details for %s", url)
+                    return _json_loads(cached)
+
+            # Fetch the webpage content without blocking the event loop
+            html_content = await self._fetch_webpage_async(url, refresh=refresh)
+            if not html_content:
+                return {
+                    'success': False,
+                    'error': 'Failed to fetch job page content',
+                    'url': url
+                }
+
+            # Cheapest tier first: many boards embed a schema.org JobPosting
+            # with exactly the fields we'd otherwise ask the AI for
+            job_details = self._extract_structured(html_content, url)
+            if job_details:
+                scrape_cache.set(result_key, json.dumps(job_details), RESULT_CACHE_TTL)
+                return job_details
+
+            # Extract text content from HTML
+            text_content = self._extract_text_content(html_content)
+
+            if len(text_content) < 100:
+                logger.warning("Very short content extracted. First 200 chars: %s", text_content[:200])
+                return {
+                    'success': False,
+                    'error': 'Unable to scrape job details. This could be due to: (1) The website blocking automated access, (2) JavaScript-heavy content, or (3) Login requirements. Please copy and paste the job details manually.',
+                    'url': url
+                }
+
+            # Don't pay for the AI call when the text clearly isn't a posting
+            if not self._looks_like_job_posting(text_content):
+                return {
+                    'success': False,
+                    'error': 'Page content does not look like a job posting. The URL may point to a login page, an expired posting, or a blocked page.',
+                    'url': url
+                }
+
+            # Use AI to extract job details; oversized pages are split and
+            # extracted chunk-by-chunk in parallel rather than truncated
+            job_details = await self._extract_with_ai_mapreduce(text_content, url)
+
+            # Only cache successful extractions so errors aren't pinned
+            if job_details.get('success'):
+                scrape_cache.set(result_key, json.dumps(job_details), RESULT_CACHE_TTL)
+
+            return job_details
+
+        except Exception as e:
+            logger.error("Error scraping job details from %s: %s", url, e)
+            return {
+                'success': False,
+                'error': f'Scraping failed: {str(e)}',
+                'url': url
+            }
+
+    async def scrape_many(self, urls: List[str], concurrency: int = 20,
+                          semaphore: Optional[asyncio.Semaphore] = None) -> List[Dict[str, Any]]:
+        """
+        Scrape several job posting URLs concurrently.
+
+        Pages are fetched and preprocessed in parallel, then the postings
+        that actually need AI extraction are packed SCRAPE_BATCH_SIZE at a
+        time into shared chat completions instead of one call per URL.
+
+        Args:
+            urls (List[str]): The job posting URLs
+            concurrency (int): Cap on simultaneously in-flight scrapes, so a
+                large import can't exhaust connections or OpenAI rate limits
+            semaphore (Optional[asyncio.Semaphore]): External cap to draw
+                from instead of a per-call one, letting callers share one
+                budget across endpoints
+
+        Returns:
+            List[Dict[str, Any]]: One result dict per URL, in the same order
+        """
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(url: str):
+            async with semaphore:
+                return await self._prepare_for_ai(url)
+
+        prepared = await asyncio.gather(*(bounded(url) for url in urls))
+
+        # Cheap tiers (cache hits, structured data, hard failures) resolved
+        # during preparation; everything else goes to the packed AI calls
+        results: List[Optional[Dict[str, Any]]] = [done for done, _ in prepared]
+        pending = [
+            (i, urls[i], text)
+            for i, (done, text) in enumerate(prepared)
+            if done is None
+        ]
+
+        async def extract_group(group):
+            async with semaphore:
+                batch = await self._extract_batch_with_ai([(url, text) for _, url, text in group])
+            for (i, url, text), result in zip(group, batch):
+                if result.get('success'):
+                    self._cache_extraction(text, result)
+                    scrape_cache.set(self._result_cache_key(url), json.dumps(result), RESULT_CACHE_TTL)
+                results[i] = result
+
+        groups = [pending[i:i + SCRAPE_BATCH_SIZE] for i in range(0, len(pending), SCRAPE_BATCH_SIZE)]
+        if groups:
+            await asyncio.gather(*(extract_group(group) for group in groups))
+        return results
+
+    async def _prepare_for_ai(self, url: str, refresh: bool = False):
+        """
+        Run the scrape pipeline up to (but not including) AI extraction.
+
+        Returns:
+            tuple: (result, None) when the URL resolved without an AI call
+                (cache hit, structured data, or failure), or (None, text)
+                when text_content still needs extraction.
+        """
+        try:
+            if not self._is_valid_url(url):
+                return {'success': False, 'error': 'Invalid URL format', 'url': url}, None
+
+            if not self.api_key:
+                return {
+                    'success': False,
+                    'error': 'OpenAI API key not found. Please set OPENAI_API_KEY environment variable.',
+                    'url': url
+                }, None
+
+            result_key = self._result_cache_key(url)
+            if not refresh:
+                cached = scrape_cache.get(result_key)
+                if cached:
+                    logger.info("Returning cached job details for %s", url)
+                    return _json_loads(cached), None
+
+            html_content = await self._fetch_webpage_async(url, refresh=refresh)
+            if not html_content:
+                return {'success': False, 'error': 'Failed to fetch job page content', 'url': url}, None
+
+            job_details = self._extract_structured(html_content, url)
+            if job_details:
+                scrape_cache.set(result_key, json.dumps(job_details), RESULT_CACHE_TTL)
+                return job_details, None
+
+            text_content = self._extract_text_content(html_content)
+
+            if len(text_content) < 100:
+                return {
+                    'success': False,
+                    'error': 'Unable to scrape job details. This could be due to: (1) The website blocking automated access, (2) JavaScript-heavy content, or (3) Login requirements. Please copy and paste the job details manually.',
+                    'url': url
+                }, None
+
+            if not self._looks_like_job_posting(text_content):
+                return {
+                    'success': False,
+                    'error': 'Page content does not look like a job posting. The URL may point to a login page, an expired posting, or a blocked page.',
+                    'url': url
+                }, None
+
+            # Identical page text scraped under another URL reuses its result
+            cached = self._get_cached_extraction(text_content, url)
+            if cached:
+                return cached, None
+
+            return None, text_content
+        except Exception as e:
+            logger.error("Error scraping job details from %s: %s", url, e)
+            return {'success': False, 'error': f'Scraping failed: {str(e)}', 'url': url}, None
+
+    async def submit_batch(self, urls: List[str]) -> Dict[str, Any]:
+        """
+        Submit a bulk extraction job through the OpenAI Batch API.
+
+        Fetches and extracts text for every URL concurrently, writes one
+        chat-completion request per posting to a JSONL batch file, and
+        submits it. Batch requests cost half as much as interactive ones and
+        draw from a separate rate-limit pool, which suits spreadsheet-style
+        imports where a result within a day is fine.
+
+        Args:
+            urls (List[str]): The job posting URLs
+
+        Returns:
+            Dict[str, Any]: batch_id plus a custom_id -> url map for
+                poll_batch, and any URLs that failed before submission
+        """
+        if not self.api_key:
+            return {'success': False, 'error': 'OpenAI API key not configured'}
+
+        async def prepare(url: str):
+            if not self._is_valid_url(url):
+                return url, None
+            html_content = await self._fetch_webpage_async(url)
+            if not html_content:
+                return url, None
+            return url, self._extract_text_content(html_content)
+
+        prepared = await asyncio.gather(*(prepare(url) for url in urls))
+
+        lines = []
+        url_map: Dict[str, str] = {}
+        failed = []
+        for url, text_content in prepared:
+            if not text_content or len(text_content) < 100:
+                failed.append(url)
+                continue
+            custom_id = hashlib.sha1(url.encode()).hexdigest()
+            url_map[custom_id] = url
+            lines.append(json.dumps({
+                'custom_id': custom_id,
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': {
+                    'model': OPENAI_MODEL,
+                    'messages': [
+                        {'role': 'system', 'content': EXTRACTION_SYSTEM_MESSAGE},
+                        {'role': 'user', 'content': self._build_extraction_prompt(text_content)}
+                    ],
+                    'max_tokens': 600,
+                    'temperature': 0.0,
+                    'response_format': {'type': 'json_object'}
+                }
+            }))
+
+        if not lines:
+            return {'success': False, 'error': 'No scrapable URLs in batch', 'failed_urls': failed}
+
+        try:
+            client = _get_async_openai_client(self.api_key)
+            batch_file = await client.files.create(
+                file=('job_extractions.jsonl', '\n'.join(lines).encode()),
+                purpose='batch'
+            )
+            batch = await client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint='/v1/chat/completions',
+                completion_window='24h'
+            )
+        except Exception as e:
+            logger.error("Failed to submit extraction batch: %s", e)
+            return {'success': False, 'error': f'Batch submission failed: {str(e)}', 'failed_urls': failed}
+
+        logger.info("Submitted extraction batch %s with %d postings", batch.id, len(lines))
+        return {
+            'success': True,
+            'batch_id': batch.id,
+            'url_map': url_map,
+            'failed_urls': failed
+        }
+
+    async def poll_batch(self, batch_id: str, url_map: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Check on a submitted extraction batch and collect finished results.
+
+        Args:
+            batch_id (str): The id returned by submit_batch
+            url_map (Optional[Dict[str, str]]): custom_id -> url map from
+                submit_batch, used to key results back to their URLs
+
+        Returns:
+            Dict[str, Any]: The batch status; once completed, also a results
+                list in the same shape scrape_job_details returns
+        """
+        url_map = url_map or {}
+        try:
+            client = _get_async_openai_client(self.api_key)
+            batch = await client.batches.retrieve(batch_id)
+            if batch.status != 'completed':
+                return {'success': True, 'batch_id': batch_id, 'status': batch.status}
+
+            output = await client.files.content(batch.output_file_id)
+            results = []
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                entry = _json_loads(line)
+                url = url_map.get(entry.get('custom_id'), entry.get('custom_id'))
+                response = entry.get('response') or {}
+                if response.get('status_code') != 200:
+                    results.append({'success': False, 'error': 'Batch request failed', 'url': url})
+                    continue
+                ai_response = response['body']['choices'][0]['message']['content'].strip()
+                result = self._parse_ai_response(ai_response, url)
+                if result.get('success'):
+                    scrape_cache.set(self._result_cache_key(url), json.dumps(result), RESULT_CACHE_TTL)
+                results.append(result)
+
+            return {'success': True, 'batch_id': batch_id, 'status': batch.status, 'results': results}
+        except Exception as e:
+            logger.error("Failed to poll extraction batch %s: %s", batch_id, e)
+            return {'success': False, 'batch_id': batch_id, 'error': f'Batch polling failed: {str(e)}'}
+
+    def _looks_like_job_posting(self, text_content: str) -> bool:
+        """Heuristic check that extracted text plausibly describes a job."""
+        return (len(text_content) >= _MIN_POSTING_CHARS
+                and _JOB_HINT_RE.search(text_content) is not None)
+
     def _is_valid_url(self, url: str) -> bool:
-        """Validate if the URL is properly formatted."""
+        """Validate if the URL is properly formatted and uses http(s)."""
         try:
             result = urlparse(url)
-            return all([result.scheme, result.netloc])
+            return result.scheme in ('http', 'https') and bool(result.netloc)
         except:
             return False
     
-    def _fetch_webpage(self, url: str) -> Optional[str]:
-        """Fetch job page content."""
+    def _extract_structured(self, html_content: str, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Extract job details from an embedded schema.org JobPosting, if present.
+
+        Returns a result dict when the posting carries at least a job title and
+        company, letting us skip the OpenAI call entirely; otherwise None.
+        """
         try:
-            logger.info(f"Fetching job page: {url}")
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            return response.text
+            if SelectolaxParser is not None:
+                tree = SelectolaxParser(html_content)
+                blocks = [node.text() for node in tree.css('script[type="application/ld+json"]')]
+            else:
+                soup = BeautifulSoup(html_content, _BS_PARSER)
+                blocks = [script.string or '' for script in soup.find_all('script', type='application/ld+json')]
+
+            for block in blocks:
+                if not block or 'JobPosting' not in block:
+                    continue
+                try:
+                    data = _json_loads(block)
+                except ValueError:
+                    continue
+                posting = _find_job_posting(data)
+                if posting:
+                    result = self._job_posting_to_result(posting, url)
+                    if result.get('job_title') and result.get('company'):
+                        logger.info("Extracted job details from JSON-LD for %s", url)
+                        return result
         except Exception as e:
-            logger.error(f"Failed to fetch job page {url}: {str(e)}")
+            logger.debug("JSON-LD extraction failed for %s: %s", url, e)
+        return None
+
+    def _job_posting_to_result(self, posting: Dict[str, Any], url: str) -> Dict[str, Any]:
+        """Map a schema.org JobPosting object onto our result dict."""
+        organization = posting.get('hiringOrganization')
+        if isinstance(organization, dict):
+            company = organization.get('name')
+        else:
+            company = organization if isinstance(organization, str) else None
+
+        # jobLocation can be a single Place or a list of them
+        location = None
+        job_location = posting.get('jobLocation')
+        if isinstance(job_location, list) and job_location:
+            job_location = job_location[0]
+        if isinstance(job_location, dict):
+            address = job_location.get('address')
+            if isinstance(address, dict):
+                parts = [address.get('addressLocality'), address.get('addressRegion'),
+                         address.get('addressCountry')]
+                location = ', '.join(p for p in parts if isinstance(p, str) and p) or None
+            elif isinstance(address, str):
+                location = address
+
+        # baseSalary is usually a MonetaryAmount with a nested QuantitativeValue
+        salary = None
+        base_salary = posting.get('baseSalary')
+        if isinstance(base_salary, dict):
+            value = base_salary.get('value')
+            currency = base_salary.get('currency') or ''
+            if isinstance(value, dict):
+                low, high = value.get('minValue'), value.get('maxValue')
+                if low is not None and high is not None:
+                    salary = f"{currency} {low}-{high}".strip()
+                elif value.get('value') is not None:
+                    salary = f"{currency} {value['value']}".strip()
+            elif value is not None:
+                salary = f"{currency} {value}".strip()
+
+        description = posting.get('description')
+        if isinstance(description, str):
+            # Descriptions are frequently HTML; flatten to clean text
+            description = _WS_RE.sub(' ', _TAG_RE.sub(' ', description)).strip() or None
+
+        return {
+            'success': True,
+            'url': url,
+            'job_board': 'json-ld',
+            'scraped_at': datetime.now().isoformat(),
+            'job_title': posting.get('title'),
+            'company': company,
+            'location': location,
+            'job_description': description,
+            'salary': salary,
+            'requirements': None,
+            'benefits': None,
+            'experience_level': None
+        }
+
+    def _html_cache_key(self, url: str) -> str:
+        """Cache key for raw page HTML."""
+        return 'html:' + hashlib.sha1(url.encode()).hexdigest()
+
+    def _result_cache_key(self, url: str) -> str:
+        """Cache key for the final extraction result, tied to model and prompt version."""
+        raw = f"{url}|{OPENAI_MODEL}|{_PROMPT_VERSION}"
+        return 'result:' + hashlib.sha1(raw.encode()).hexdigest()
+
+    def _text_cache_key(self, text_content: str) -> str:
+        """Content-addressed cache key for an extraction, keyed on the page text itself."""
+        raw_suffix = f"|{OPENAI_MODEL}|{_PROMPT_VERSION}"
+        return 'text:' + hashlib.sha256((text_content + raw_suffix).encode()).hexdigest()
+
+    def _get_cached_extraction(self, text_content: str, url: str) -> Optional[Dict[str, Any]]:
+        """Return a cached extraction for identical page text, rekeyed to url."""
+        cached = scrape_cache.get(self._text_cache_key(text_content))
+        if not cached:
             return None
-    
+        result = _json_loads(cached)
+        result['url'] = url
+        return result
+
+    def _cache_extraction(self, text_content: str, result: Dict[str, Any]) -> None:
+        """Store a successful extraction under the text-content hash."""
+        if result.get('success'):
+            scrape_cache.set(self._text_cache_key(text_content), json.dumps(result), RESULT_CACHE_TTL)
+
+    def _fetch_webpage(self, url: str, refresh: bool = False) -> Optional[str]:
+        """Fetch job page content, using the on-disk cache when possible."""
+        cache_key = self._html_cache_key(url)
+        if not refresh:
+            cached = scrape_cache.get(cache_key)
+            if cached:
+                logger.info("Using cached HTML for %s", url)
+                return cached
+
+        try:
+            logger.info("Fetching job page: %s", url)
+            # (connect, read) timeout; stream so we can bound how much we read
+            with self.session.get(url, timeout=(5, 15), stream=True) as response:
+                response.raise_for_status()
+                # Bail before downloading the body of PDFs/binary blobs
+                ctype = response.headers.get('Content-Type', '').lower()
+                if ctype and 'html' not in ctype and 'xml' not in ctype:
+                    logger.warning("Skipping non-HTML content (%s) from %s", ctype, url)
+                    return None
+                # Read raw bytes and decode once at the end: decode_unicode
+                # silently yields bytes when the response declares no charset
+                # (common for application/xhtml+xml), breaking the join
+                buf = []
+                size = 0
+                for chunk in response.iter_content(FETCH_CHUNK_SIZE):
+                    buf.append(chunk)
+                    size += len(chunk)
+                    if size > MAX_FETCH_SIZE:
+                        logger.warning("Truncating oversized page (%d+ bytes) from %s", size, url)
+                        break
+                html = b''.join(buf).decode(response.encoding or 'utf-8', errors='replace')
+            scrape_cache.set(cache_key, html, HTML_CACHE_TTL)
+            return html
+        except Exception as e:
+            logger.error("Failed to fetch job page %s: %s", url, e)
+            return None
+
+    async def _fetch_webpage_async(self, url: str, refresh: bool = False) -> Optional[str]:
+        """Fetch job page content using the shared aiohttp session."""
+        import aiohttp
+
+        cache_key = self._html_cache_key(url)
+        if not refresh:
+            cached = scrape_cache.get(cache_key)
+            if cached:
+                logger.info("Using cached HTML for %s", url)
+                return cached
+
+        try:
+            logger.info("Fetching job page: %s", url)
+            session = await _session()
+            timeout = aiohttp.ClientTimeout(total=15, connect=5)
+            async with _rate_limiter.limit(urlparse(url).netloc):
+                async with session.get(url, timeout=timeout) as response:
+                    response.raise_for_status()
+                    # Bail before downloading the body of PDFs/binary blobs
+                    ctype = response.headers.get('Content-Type', '').lower()
+                    if ctype and 'html' not in ctype and 'xml' not in ctype:
+                        logger.warning("Skipping non-HTML content (%s) from %s", ctype, url)
+                        return None
+                    # Bound how much of the body we read, mirroring the sync path
+                    raw = await response.content.read(MAX_FETCH_SIZE)
+                    html = raw.decode(response.get_encoding(), errors='replace')
+            scrape_cache.set(cache_key, html, HTML_CACHE_TTL)
+            return html
+        except Exception as e:
+            logger.error("Failed to fetch job page %s: %s", url, e)
+            return None
+
     def _extract_text_content(self, html_content: str) -> str:
         """Extract clean text content from job page HTML."""
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Remove script, style, and navigation elements
-            for element in soup(["script", "style", "nav", "header", "footer", "aside"]):
-                element.decompose()
-            
-            # Try to find main content areas first
-            main_content = None
-            
-            # Look for common job posting content selectors
-            selectors = [
-                '[class*="job-description"]',
-                '[class*="description"]',
-                '[class*="content"]',
-                '[class*="posting"]',
-                'main',
-                'article',
-                '.content',
-                '#content',
-                '.job-content',
-                '.posting-content'
-            ]
-            
-            for selector in selectors:
-                main_content = soup.select_one(selector)
-                if main_content:
-                    break
-            
-            # If no specific content area found, use body
-            if not main_content:
-                main_content = soup.body or soup
-            
-            # Extract text with better structure
-            text_parts = []
-            
-            # Get headings and their content
-            for heading in main_content.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-                heading_text = heading.get_text(strip=True)
-                if heading_text:
-                    text_parts.append(f"\n## {heading_text}")
-                
-                # Get content after heading until next heading
-                next_elem = heading.find_next_sibling()
-                while next_elem and next_elem.name not in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                    if next_elem.name in ['p', 'div', 'li']:
-                        content = next_elem.get_text(strip=True)
-                        if content and len(content) > 10:  # Filter out very short content
-                            text_parts.append(content)
-                    next_elem = next_elem.find_next_sibling()
-            
-            # If no structured content found, get all paragraphs
-            if len(text_parts) < 3:
-                paragraphs = main_content.find_all(['p', 'div', 'li'])
-                for p in paragraphs:
-                    content = p.get_text(strip=True)
-                    if content and len(content) > 20:  # Filter out very short content
-                        text_parts.append(content)
-            
+            # Collect structured text parts with the fastest available parser
+            if SelectolaxParser is not None:
+                text_parts = self._collect_text_parts_selectolax(html_content)
+            else:
+                text_parts = self._collect_text_parts_bs4(html_content)
+
             # Join all text parts
             text = '\n\n'.join(text_parts)
-            
-            # Clean up whitespace
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            # Limit text length but preserve structure
-            if len(text) > 12000:  # Increased limit for better extraction
-                # Try to keep the most relevant parts
-                sentences = text.split('. ')
-                if len(sentences) > 10:
-                    # Keep first 8 sentences and last 2
-                    text = '. '.join(sentences[:8] + sentences[-2:]) + "..."
-                else:
-                    text = text[:12000] + "..."
-            
+
+            # Clean up whitespace with a single C-level regex pass
+            text = _WS_RE.sub(' ', text).strip()
+
+            # Truncation happens in _truncate_to_token_budget, right before the
+            # AI call, so it can use an exact token count
             return text
         except Exception as e:
-            logger.error(f"Failed to extract text content: {str(e)}")
+            logger.error("Failed to extract text content: %s", e)
             return ""
+
+    def _collect_text_parts_selectolax(self, html_content: str) -> List[str]:
+        """Collect structured text parts using the C-backed selectolax parser."""
+        tree = SelectolaxParser(html_content)
+
+        # Remove script, style, and navigation elements
+        for tag in ('script', 'style', 'nav', 'header', 'footer', 'aside'):
+            for node in tree.css(tag):
+                node.decompose()
+
+        # Look for the main content area, falling back to the whole body
+        main_content = tree.css_first(_MAIN_SELECTOR)
+        if main_content is None:
+            main_content = tree.body or tree.root
+
+        # Extract text with better structure in a single pass over the tree:
+        # headings start a new section, p/div/li text accumulates under it
+        text_parts = []
+        for node in main_content.traverse(include_text=False):
+            tag = node.tag
+            if tag in _HEADING_TAG_SET:
+                heading_text = node.text(separator=' ', strip=True)
+                if heading_text:
+                    text_parts.append(f"\n## {heading_text}")
+            elif tag in ('p', 'li'):
+                content = node.text(separator=' ', strip=True)
+                if content and len(content) > 10:  # Filter out very short content
+                    text_parts.append(content)
+
+        # If no structured content found, get all paragraphs
+        if len(text_parts) < 3:
+            for p in main_content.css('p, div, li'):
+                content = p.text(separator=' ', strip=True)
+                if content and len(content) > 20:  # Filter out very short content
+                    text_parts.append(content)
+
+        return text_parts
+
+    def _collect_text_parts_bs4(self, html_content: str) -> List[str]:
+        """Collect structured text parts with BeautifulSoup (lxml backend)."""
+        # Parse only content-bearing tags; nav/header/footer/aside and
+        # top-level scripts never enter the tree
+        soup = BeautifulSoup(html_content, _BS_PARSER, parse_only=_BS4_STRAINER)
+
+        # Scripts and styles nested inside kept containers still need removing
+        for element in soup(["script", "style"]):
+            element.decompose()
+
+        # Look for the main content area: one class-predicate scan covers all
+        # the [class*=...] selectors, then semantic containers, then id
+        main_content = (
+            soup.find(attrs={'class': _CONTENT_CLASS_RE})
+            or soup.find(['main', 'article'])
+            or soup.find(id='content')
+        )
+
+        # If no specific content area found, use the whole strained tree
+        if not main_content:
+            main_content = soup.body or soup
+
+        # Extract text with better structure in a single pass over the tree:
+        # headings start a new section, p/li text accumulates under it
+        text_parts = []
+        for el in main_content.find_all(True):
+            name = el.name
+            if name in _HEADING_TAG_SET:
+                heading_text = el.get_text(strip=True)
+                if heading_text:
+                    text_parts.append(f"\n## {heading_text}")
+            elif name in ('p', 'li'):
+                content = el.get_text(strip=True)
+                if content and len(content) > 10:  # Filter out very short content
+                    text_parts.append(content)
+
+        # If no structured content found, get all paragraphs
+        if len(text_parts) < 3:
+            paragraphs = main_content.find_all(['p', 'div', 'li'])
+            for p in paragraphs:
+                content = p.get_text(strip=True)
+                if content and len(content) > 20:  # Filter out very short content
+                    text_parts.append(content)
+
+        return text_parts
     
+    def _truncate_to_token_budget(self, text: str) -> str:
+        """Trim posting text to the prompt token budget, keeping head and tail."""
+        if _ENCODER is not None:
+            tokens = _ENCODER.encode(text)
+            if len(tokens) > MAX_PROMPT_TOKENS:
+                text = _ENCODER.decode(tokens[:_HEAD_TOKENS] + tokens[-_TAIL_TOKENS:])
+            return text
+
+        # Fallback when tiktoken is unavailable: approximate with characters
+        if len(text) > 12000:
+            sentences = text.split('. ')
+            if len(sentences) > 10:
+                # Keep first 8 sentences and last 2
+                text = '. '.join(sentences[:8] + sentences[-2:]) + "..."
+            else:
+                text = text[:12000] + "..."
+        return text
+
+    def _build_extraction_prompt(self, text_content: str) -> str:
+        """Build the job extraction prompt sent to OpenAI, applying the token budget."""
+        text_content = self._truncate_to_token_budget(text_content)
+        return f"""Return a JSON object with these fields:
+- job_title: The exact job title/position as written
+- company: The company name as stated
+- location: The job location if explicitly mentioned (city, state, country, remote/hybrid/onsite)
+- job_description: A clean, well-structured description based ONLY on what's written in the posting
+- salary: ONLY if salary/compensation is explicitly mentioned
+- requirements: ONLY the explicitly stated requirements, qualifications, and skills
+- benefits: ONLY the explicitly mentioned benefits or perks
+- experience_level: ONLY if clearly stated (Entry, Mid, Senior, Executive)
+
+Job posting text:
+{text_content}"""
+
     def _extract_with_ai(self, text_content: str, url: str) -> Dict[str, Any]:
         """Use OpenAI to extract job details from job posting text with enhanced description extraction."""
+        # Identical page text (mirrored postings, re-imports) skips the paid call
+        cached = self._get_cached_extraction(text_content, url)
+        if cached:
+            return cached
         try:
-            from openai import OpenAI
-            
-            # Set up OpenAI client
-            client = OpenAI(api_key=self.api_key)
-            
-            # Create an enhanced prompt for better job extraction
-            prompt = f"""
-            You are a precise job posting analyzer. Extract ONLY the information that is explicitly stated in the job posting text. DO NOT infer, assume, or generate any information that is not directly mentioned.
-
-            Return the information in JSON format with the following fields:
-            - job_title: The exact job title/position as written
-            - company: The company name as stated
-            - location: The job location if explicitly mentioned (city, state, country, remote/hybrid/onsite)
-            - job_description: A clean, well-structured description based ONLY on what's written in the posting
-            - salary: ONLY if salary/compensation is explicitly mentioned (range, benefits, etc.)
-            - requirements: ONLY the explicitly stated requirements, qualifications, and skills
-            - benefits: ONLY the explicitly mentioned benefits or perks
-            - experience_level: ONLY if clearly stated (Entry, Mid, Senior, Executive)
-
-            CRITICAL RULES:
-            - If information is not explicitly stated, set the field to null
-            - Do NOT make up salary ranges, benefits, or requirements
-            - Do NOT infer experience levels unless clearly stated
-            - Do NOT add generic job descriptions
-            - Only extract what is actually written in the posting
-
-            If any field cannot be determined from the text, set it to null.
-
-            Job posting text:
-            {text_content}
-
-            Return only valid JSON without any additional text or formatting.
-            """
-            
+            # Reuse the shared OpenAI client
+            client = _get_openai_client(self.api_key)
+
             # Call OpenAI API with better parameters
             response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
+                model=OPENAI_MODEL,
                 messages=[
-                    {"role": "system", "content": "You are a precise job posting analyzer that extracts only factual information explicitly stated in job postings. You never infer, assume, or generate information that isn't directly mentioned. Always respond with valid JSON only."},
-                    {"role": "user", "content": prompt}
+                    {"role": "system", "content": EXTRACTION_SYSTEM_MESSAGE},
+                    {"role": "user", "content": self._build_extraction_prompt(text_content)}
                 ],
                 max_tokens=600,
                 temperature=0.0,  # Zero temperature for maximum factual accuracy
-                presence_penalty=0.0,  # No creativity encouraged
-                frequency_penalty=0.0   # No repetition penalty needed
+                response_format={"type": "json_object"}
             )
-            
+
             # Parse the response
             ai_response = response.choices[0].message.content.strip()
-            
-            # Try to extract JSON from the response
-            try:
-                # Remove any markdown formatting if present
-                if ai_response.startswith('```json'):
-                    ai_response = ai_response[7:]
-                if ai_response.endswith('```'):
-                    ai_response = ai_response[:-3]
-                
-                job_data = json.loads(ai_response)
-                
-                # Validate and structure the response
-                result = {
-                    'success': True,
-                    'url': url,
-                    'job_board': 'ai_extracted',
-                    'scraped_at': datetime.now().isoformat(),
-                    'job_title': job_data.get('job_title'),
-                    'company': job_data.get('company'),
-                    'location': job_data.get('location'),
-                    'job_description': job_data.get('job_description'),
-                    'salary': job_data.get('salary'),
-                    'requirements': job_data.get('requirements'),
-                    'benefits': job_data.get('benefits'),
-                    'experience_level': job_data.get('experience_level')
-                }
-                
-                # Log what we extracted for debugging
-                logger.info(f"AI extracted data: job_title='{result.get('job_title')}', company='{result.get('company')}'")
-                
-                # Validate that we got at least one essential piece of information
-                if not result.get('job_title') and not result.get('company'):
-                    logger.warning(f"AI failed to extract basic job info. Full response: {job_data}")
-                    result['success'] = False
-                    result['error'] = 'Could not extract basic job information from posting. The job posting might be too short, blocked, or in an unsupported format.'
-                
-                return result
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse AI response as JSON: {str(e)}")
-                logger.error(f"AI Response: {ai_response}")
-                return {
-                    'success': False,
-                    'error': 'Failed to parse AI response',
-                    'url': url
-                }
-                
+
+            result = self._parse_ai_response(ai_response, url)
+            self._cache_extraction(text_content, result)
+            return result
+
+        except Exception as e:
+            logger.error("AI extraction failed: %s", e)
+            return {
+                'success': False,
+                'error': f'AI extraction failed: {str(e)}',
+                'url': url
+            }
+
+    async def _extract_with_ai_async(self, text_content: str, url: str) -> Dict[str, Any]:
+        """Async variant of _extract_with_ai so AI calls for different URLs can overlap."""
+        # Identical page text (mirrored postings, re-imports) skips the paid call
+        cached = self._get_cached_extraction(text_content, url)
+        if cached:
+            return cached
+        try:
+            # Reuse the shared OpenAI client
+            client = _get_async_openai_client(self.api_key)
+
+            # Call OpenAI API with better parameters
+            response = await client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": EXTRACTION_SYSTEM_MESSAGE},
+                    {"role": "user", "content": self._build_extraction_prompt(text_content)}
+                ],
+                max_tokens=600,
+                temperature=0.0,  # Zero temperature for maximum factual accuracy
+                response_format={"type": "json_object"}
+            )
+
+            # Parse the response
+            ai_response = response.choices[0].message.content.strip()
+
+            result = self._parse_ai_response(ai_response, url)
+            self._cache_extraction(text_content, result)
+            return result
+
         except Exception as e:
-            logger.error(f"AI extraction failed: {str(e)}")
+            logger.error("AI extraction failed: %s", e)
             return {
                 'success': False,
                 'error': f'AI extraction failed: {str(e)}',
                 'url': url
             }
 
+    def _split_into_token_chunks(self, text: str) -> List[str]:
+        """
+        Split posting text into chunks of at most MAP_CHUNK_TOKENS tokens.
+
+        Splits on paragraph boundaries so no sentence is cut mid-way. Returns
+        a single-element list when the text already fits one chunk or when
+        tiktoken is unavailable.
+        """
+        if _ENCODER is None:
+            return [text]
+
+        if len(_ENCODER.encode(text)) <= MAP_CHUNK_TOKENS:
+            return [text]
+
+        chunks = []
+        current_parts: List[str] = []
+        current_tokens = 0
+        for paragraph in text.split('\n'):
+            paragraph_tokens = len(_ENCODER.encode(paragraph)) + 1
+            if current_parts and current_tokens + paragraph_tokens > MAP_CHUNK_TOKENS:
+                chunks.append('\n'.join(current_parts))
+                current_parts = []
+                current_tokens = 0
+            current_parts.append(paragraph)
+            current_tokens += paragraph_tokens
+        if current_parts:
+            chunks.append('\n'.join(current_parts))
+        return chunks
+
+    def _merge_chunk_results(self, results: List[Dict[str, Any]], url: str) -> Dict[str, Any]:
+        """
+        Merge per-chunk extraction results into a single job details dict.
+
+        Each field takes the first non-null value across chunks, except
+        experience_level which is decided by majority vote since later
+        chunks often mislabel it from boilerplate.
+        """
+        successful = [r for r in results if r.get('success')]
+        if not successful:
+            # Surface the first failure rather than inventing an empty result
+            return results[0] if results else {
+                'success': False,
+                'error': 'AI extraction produced no results',
+                'url': url
+            }
+
+        fields = ('job_title', 'company', 'location', 'job_description',
+                  'salary', 'requirements', 'benefits')
+        merged = dict(successful[0])
+        for field in fields:
+            if merged.get(field):
+                continue
+            for result in successful[1:]:
+                if result.get(field):
+                    merged[field] = result[field]
+                    break
+
+        votes: Dict[str, int] = {}
+        for result in successful:
+            level = result.get('experience_level')
+            if level:
+                votes[level] = votes.get(level, 0) + 1
+        if votes:
+            merged['experience_level'] = max(votes, key=votes.get)
+
+        if not merged.get('job_title') and not merged.get('company'):
+            merged['success'] = False
+            merged['error'] = 'Could not extract basic job information from posting. The job posting might be too short, blocked, or in an unsupported format.'
+        return merged
+
+    async def _extract_with_ai_mapreduce(self, text_content: str, url: str) -> Dict[str, Any]:
+        """
+        Extract job details, splitting oversized postings into token chunks.
+
+        Pages within the prompt budget take the plain single-call path; larger
+        ones are extracted per-chunk in parallel and merged, so no section is
+        silently dropped by truncation.
+        """
+        chunks = self._split_into_token_chunks(text_content)
+        if len(chunks) == 1:
+            return await self._extract_with_ai_async(chunks[0], url)
+
+        logger.info("Splitting %s into %d chunks for map-reduce extraction", url, len(chunks))
+        results = await asyncio.gather(
+            *(self._extract_with_ai_async(chunk, url) for chunk in chunks)
+        )
+        return self._merge_chunk_results(list(results), url)
+
+    async def _extract_batch_with_ai(self, items: List[tuple]) -> List[Dict[str, Any]]:
+        """
+        Extract job details for several postings in one chat completion.
+
+        Packing K postings into a single request amortizes the system message
+        and schema text across the batch and replaces K round-trips with one.
+        Each posting's text is trimmed to an equal share of the prompt budget.
+
+        Args:
+            items (List[tuple]): (url, text_content) pairs
+
+        Returns:
+            List[Dict[str, Any]]: One result dict per posting, in order
+        """
+        if not items:
+            return []
+        if len(items) == 1:
+            url, text_content = items[0]
+            return [await self._extract_with_ai_async(text_content, url)]
+
+        per_posting_budget = max(MAX_PROMPT_TOKENS // len(items), 500)
+        sections = []
+        for i, (url, text_content) in enumerate(items):
+            if _ENCODER is not None:
+                tokens = _ENCODER.encode(text_content)
+                if len(tokens) > per_posting_budget:
+                    text_content = _ENCODER.decode(tokens[:per_posting_budget])
+            else:
+                text_content = text_content[:per_posting_budget * 4]
+            sections.append(f"===POST {i}===\n{text_content}")
+
+        prompt = (
+            f"For each of the following {len(items)} job postings (delimited by ===POST i===), "
+            'extract these fields: job_title, company, location, job_description, salary, '
+            'requirements, benefits, experience_level (Entry, Mid, Senior, Executive). '
+            'Return a JSON object {"results": [...]} with one object per posting, '
+            'in order, each including its "idx".\n\n' + '\n\n'.join(sections)
+        )
+
+        try:
+            client = _get_async_openai_client(self.api_key)
+            response = await client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": EXTRACTION_SYSTEM_MESSAGE},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=600 * len(items),
+                temperature=0.0,
+                response_format={"type": "json_object"}
+            )
+            ai_response = response.choices[0].message.content.strip()
+            payload = _extract_json_object(ai_response) or ai_response
+            parsed = _json_loads(payload)
+        except Exception as e:
+            logger.error("Batched AI extraction failed: %s", e)
+            return [
+                {'success': False, 'error': f'AI extraction failed: {str(e)}', 'url': url}
+                for url, _ in items
+            ]
+
+        # Key the returned objects back to their postings by idx, falling
+        # back to list order when the model omits it
+        by_idx = {}
+        for pos, entry in enumerate(parsed.get('results', [])):
+            if isinstance(entry, dict):
+                by_idx[entry.get('idx', pos)] = entry
+
+        results = []
+        for i, (url, _) in enumerate(items):
+            job_data = by_idx.get(i)
+            if not job_data:
+                results.append({'success': False, 'error': 'Missing posting in batched AI response', 'url': url})
+                continue
+            result = {
+                'success': True,
+                'url': url,
+                'job_board': 'ai_extracted',
+                'scraped_at': datetime.now().isoformat(),
+                'job_title': job_data.get('job_title'),
+                'company': job_data.get('company'),
+                'location': job_data.get('location'),
+                'job_description': job_data.get('job_description'),
+                'salary': job_data.get('salary'),
+                'requirements': job_data.get('requirements'),
+                'benefits': job_data.get('benefits'),
+                'experience_level': job_data.get('experience_level')
+            }
+            if not result.get('job_title') and not result.get('company'):
+                result['success'] = False
+                result['error'] = 'Could not extract basic job information from posting. The job posting might be too short, blocked, or in an unsupported format.'
+            results.append(result)
+        return results
+
+    def _parse_ai_response(self, ai_response: str, url: str) -> Dict[str, Any]:
+        """Parse and validate the JSON returned by OpenAI."""
+        try:
+            # Pluck the first balanced JSON object in case the model wrapped
+            # its answer in prose or a markdown fence
+            payload = _extract_json_object(ai_response) or ai_response
+            job_data = _json_loads(payload)
+
+            # Validate and structure the response
+            result = {
+                'success': True,
+                'url': url,
+                'job_board': 'ai_extracted',
+                'scraped_at': datetime.now().isoformat(),
+                'job_title': job_data.get('job_title'),
+                'company': job_data.get('company'),
+                'location': job_data.get('location'),
+                'job_description': job_data.get('job_description'),
+                'salary': job_data.get('salary'),
+                'requirements': job_data.get('requirements'),
+                'benefits': job_data.get('benefits'),
+                'experience_level': job_data.get('experience_level')
+            }
+
+            # Log what we extracted for debugging
+            logger.info("AI extracted data: job_title=%r, company=%r", result.get('job_title'), result.get('company'))
+
+            # Validate that we got at least one essential piece of information
+            if not result.get('job_title') and not result.get('company'):
+                logger.warning("AI failed to extract basic job info. Full response: %s", job_data)
+                result['success'] = False
+                result['error'] = 'Could not extract basic job information from posting. The job posting might be too short, blocked, or in an unsupported format.'
+
+            return result
+
+        except ValueError as e:  # covers json and orjson decode errors
+            logger.error("Failed to parse AI response as JSON: %s", e)
+            logger.error("AI Response: %s", ai_response)
+            return {
+                'success': False,
+                'error': 'Failed to parse AI response',
+                'url': url
+            }
+
 
 # Create a global AI scraper instance
 ai_scraper = AIScraper()
 
+# Freeze the public surface; everything else in here is an implementation detail
+__all__ = ['AIScraper', 'ai_scraper', 'scrape_job_details_with_ai',
+           'enhance_job_description_with_ai', 'enhance_many']
+
 
 def scrape_job_details_with_ai(url: str) -> Dict[str, Any]:
     """
@@ -350,8 +1445,6 @@ def enhance_job_description_with_ai(job_description: str, job_title: str = None,
         Dict[str, Any]: Enhanced job description with structured sections
     """
     try:
-        from openai import OpenAI
-        
         # Get API key
         api_key = os.getenv('OPENAI_API_KEY')
         if not api_key:
@@ -360,8 +1453,19 @@ def enhance_job_description_with_ai(job_description: str, job_title: str = None,
                 'error': 'OpenAI API key not found. Please set OPENAI_API_KEY environment variable.'
             }
         
-        # Set up OpenAI client
-        client = OpenAI(api_key=api_key)
+        # Enhancement is deterministic for a given input, so repeat requests
+        # for the same description skip the paid call entirely
+        digest = hashlib.blake2b(
+            f"{job_description}|{job_title}|{company}|{OPENAI_MODEL}".encode(),
+            digest_size=16
+        ).hexdigest()
+        cache_key = f"enhance:{digest}"
+        cached = scrape_cache.get(cache_key)
+        if cached:
+            return _json_loads(cached)
+        
+        # Reuse the shared OpenAI client
+        client = _get_openai_client(api_key)
         
         # Build context for better enhancement
         context = ""
@@ -391,21 +1495,18 @@ def enhance_job_description_with_ai(job_description: str, job_title: str = None,
 
         Original job description:
         {job_description}
-
-        Return only valid JSON without any additional text or formatting.
         """
         
         # Call OpenAI API
         response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
+            model=OPENAI_MODEL,
             messages=[
-                {"role": "system", "content": "You are an expert HR professional who excels at organizing and enhancing job descriptions. You extract key information and present it in a clear, structured format. Always respond with valid JSON only."},
+                {"role": "system", "content": "You are an expert HR professional who excels at organizing and enhancing job descriptions. You extract key information and present it in a clear, structured format. Always respond with a single valid JSON object."},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=800,
             temperature=0.1,  # Low temperature for consistent formatting
-            presence_penalty=0.0,
-            frequency_penalty=0.0
+            response_format={"type": "json_object"}
         )
         
         # Parse the response
@@ -413,13 +1514,8 @@ def enhance_job_description_with_ai(job_description: str, job_title: str = None,
         
         # Try to extract JSON from the response
         try:
-            # Remove any markdown formatting if present
-            if ai_response.startswith('```json'):
-                ai_response = ai_response[7:]
-            if ai_response.endswith('```'):
-                ai_response = ai_response[:-3]
-            
-            enhanced_data = json.loads(ai_response)
+            payload = _extract_json_object(ai_response) or ai_response
+            enhanced_data = _json_loads(payload)
             
             # Structure the response
             result = {
@@ -430,19 +1526,135 @@ def enhance_job_description_with_ai(job_description: str, job_title: str = None,
                 'benefits': enhanced_data.get('benefits')
             }
             
+            scrape_cache.set(cache_key, json.dumps(result), RESULT_CACHE_TTL)
             return result
             
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse AI enhancement response as JSON: {str(e)}")
-            logger.error(f"AI Response: {ai_response}")
+        except ValueError as e:  # covers json and orjson decode errors
+            logger.error("Failed to parse AI enhancement response as JSON: %s", e)
+            logger.error("AI Response: %s", ai_response)
             return {
                 'success': False,
                 'error': 'Failed to parse AI response'
             }
             
     except Exception as e:
-        logger.error(f"Job description enhancement failed: {str(e)}")
+        logger.error("Job description enhancement failed: %s", e)
         return {
             'success': False,
             'error': f'Enhancement failed: {str(e)}'
-        } 
\ No newline at end of file
+        }
+
+
+# Enhancement batching: amortize the system message and instructions over
+# several descriptions per call, while staying under the model context
+ENHANCE_BATCH_SIZE = 5
+ENHANCE_BATCH_TOKEN_BUDGET = 8000
+
+
+def _batch_jobs_for_enhancement(jobs: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Split jobs into batches bounded by count and total description tokens."""
+    batches = []
+    current = []
+    current_tokens = 0
+    for job in jobs:
+        description = job.get('job_description') or ''
+        if _ENCODER is not None:
+            tokens = len(_ENCODER.encode(description))
+        else:
+            tokens = len(description) // 4  # rough chars-per-token estimate
+        if current and (len(current) >= ENHANCE_BATCH_SIZE
+                        or current_tokens + tokens > ENHANCE_BATCH_TOKEN_BUDGET):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(job)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def _enhance_batch(batch: List[Dict[str, Any]], api_key: str) -> List[Dict[str, Any]]:
+    """Enhance one batch of job descriptions with a single OpenAI call."""
+    inputs = [
+        {
+            'idx': i,
+            'job_title': job.get('job_title'),
+            'company': job.get('company'),
+            'job_description': job.get('job_description')
+        }
+        for i, job in enumerate(batch)
+    ]
+
+    prompt = f"""Enhance each of the job descriptions below. Return a JSON object of the form
+{{"results": [{{"idx": <input idx>, "enhanced_description": ..., "key_requirements": ..., "key_responsibilities": ..., "benefits": ...}}]}}
+with exactly one element per input, keeping each element's idx.
+
+Field guidelines (same as single enhancement):
+- enhanced_description: clean 2-3 paragraph summary, max 800 characters
+- key_requirements / key_responsibilities / benefits: single strings with • bullet points
+- Set a field to null when the input has no relevant information
+
+Inputs:
+{json.dumps(inputs)}"""
+
+    try:
+        client = _get_async_openai_client(api_key)
+        response = await client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=[
+                {"role": "system", "content": "You are an expert HR professional who excels at organizing and enhancing job descriptions. You extract key information and present it in a clear, structured format. Always respond with a single valid JSON object."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=800 * len(batch),
+            temperature=0.1,
+            response_format={"type": "json_object"}
+        )
+        ai_response = response.choices[0].message.content.strip()
+        payload = _extract_json_object(ai_response) or ai_response
+        by_idx = {item.get('idx'): item for item in _json_loads(payload).get('results', [])}
+    except Exception as e:
+        logger.error("Batch enhancement failed: %s", e)
+        return [{'success': False, 'error': f'Enhancement failed: {str(e)}'} for _ in batch]
+
+    results = []
+    for i in range(len(batch)):
+        item = by_idx.get(i)
+        if item is None:
+            results.append({'success': False, 'error': 'No result returned for this description'})
+        else:
+            results.append({
+                'success': True,
+                'enhanced_description': item.get('enhanced_description'),
+                'key_requirements': item.get('key_requirements'),
+                'key_responsibilities': item.get('key_responsibilities'),
+                'benefits': item.get('benefits')
+            })
+    return results
+
+
+async def enhance_many(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Enhance several job descriptions, batching up to 5 per OpenAI call.
+
+    Args:
+        jobs (List[Dict[str, Any]]): Dicts with job_description and optional
+            job_title / company keys
+
+    Returns:
+        List[Dict[str, Any]]: One enhancement result per input, in order
+    """
+    if not jobs:
+        return []
+
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        error = {
+            'success': False,
+            'error': 'OpenAI API key not found. Please set OPENAI_API_KEY environment variable.'
+        }
+        return [dict(error) for _ in jobs]
+
+    batches = _batch_jobs_for_enhancement(jobs)
+    batch_results = await asyncio.gather(*(_enhance_batch(batch, api_key) for batch in batches))
+    return [result for batch in batch_results for result in batch]
\ No newline at end of file
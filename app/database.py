@@ -17,7 +17,17 @@ def create_database_engine():
     # First, try PostgreSQL (Supabase)
     try:
         logger.info("Attempting to connect to PostgreSQL (Supabase)...")
-        engine = create_engine(POSTGRES_URL)
+        # Pool sized for concurrent FastAPI requests; pre-ping and recycle
+        # guard against Supabase closing idle connections
+        engine = create_engine(
+            POSTGRES_URL,
+            pool_size=20,
+            max_overflow=20,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+            pool_timeout=10,
+            query_cache_size=1200,  # fits every filter/sort statement variant
+        )
         # Test the connection
         connection = engine.connect()
         connection.close()
@@ -31,7 +41,8 @@ def create_database_engine():
         try:
             engine = create_engine(
                 SQLITE_URL, 
-                connect_args={"check_same_thread": False}  # Needed for SQLite
+                connect_args={"check_same_thread": False},  # Needed for SQLite
+                query_cache_size=1200,
             )
             # Test the connection
             connection = engine.connect()
@@ -45,8 +56,9 @@ def create_database_engine():
 # Create engine with fallback
 engine = create_database_engine()
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create SessionLocal class; one Session per request via get_db.
+# expire_on_commit=False keeps attributes readable after commit without a reload
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Dependency to get database session
 def get_db():
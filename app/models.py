@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, func, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, func, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -15,9 +15,9 @@ class JobApplication(Base):
     location = Column(String(255), nullable=True)
     salary = Column(String(255), nullable=True)  # Changed from Float to String
     job_url = Column(String(500), nullable=True)
-    date_applied = Column(DateTime, nullable=False)
+    date_applied = Column(DateTime, nullable=False, index=True)
     date_job_posted = Column(DateTime, nullable=True)
-    application_status = Column(String(50), nullable=False, default="Applied")
+    application_status = Column(String(50), nullable=False, default="Applied", index=True)
     interview_stage = Column(String(50), nullable=False, default="None")
     notes = Column(Text, nullable=True)
     # Referral information
@@ -25,27 +25,51 @@ class JobApplication(Base):
     referral_relationship = Column(String(100), nullable=True)  # e.g., "Former colleague", "Friend", "LinkedIn connection"
     referral_date = Column(DateTime, nullable=True)  # When the referral was made
     referral_notes = Column(Text, nullable=True)  # Additional notes about the referral
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, server_default=func.now(), default=func.now(), index=True)
+    updated_at = Column(DateTime, server_default=func.now(), default=func.now(), onupdate=func.now(), index=True)
     
     # Relationship to follow-ups
     follow_ups = relationship("FollowUp", back_populates="job_application", cascade="all, delete-orphan")
 
+    # Lets the stats aggregates run as one index-only range scan, plus
+    # trigram GIN indexes so the ILIKE '%term%' filters can use an index on
+    # PostgreSQL (needs pg_trgm; ensured at startup). Other dialects ignore
+    # the postgresql_* options and build ordinary indexes.
+    __table_args__ = (
+        Index("ix_job_applications_created_status", "created_at", "application_status"),
+        Index("ix_job_applications_company_trgm", "company",
+              postgresql_using="gin", postgresql_ops={"company": "gin_trgm_ops"}),
+        Index("ix_job_applications_job_title_trgm", "job_title",
+              postgresql_using="gin", postgresql_ops={"job_title": "gin_trgm_ops"}),
+    )
+
+    # Fetch server-generated defaults (created_at/updated_at) in the INSERT's
+    # round-trip so handlers don't need a refresh afterwards
+    __mapper_args__ = {"eager_defaults": True}
+
 
 class FollowUp(Base):
     __tablename__ = "follow_ups"
 
     id = Column(Integer, primary_key=True, index=True)
-    job_application_id = Column(Integer, ForeignKey("job_applications.id"), nullable=False)
-    follow_up_type = Column(String(50), nullable=False)  # e.g., "Phone Call", "Email", "Interview", "Follow-up"
+    job_application_id = Column(Integer, ForeignKey("job_applications.id"), nullable=False, index=True)
+    follow_up_type = Column(String(50), nullable=False, index=True)  # e.g., "Phone Call", "Email", "Interview", "Follow-up"
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    date = Column(DateTime, nullable=False)
-    status = Column(String(50), nullable=False, default="Pending")  # e.g., "Pending", "Completed", "Cancelled"
+    date = Column(DateTime, nullable=False, index=True)
+    status = Column(String(50), nullable=False, default="Pending", index=True)  # e.g., "Pending", "Completed", "Cancelled"
     outcome = Column(String(255), nullable=True)  # e.g., "Scheduled next round", "Rejected", "No response"
     notes = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, server_default=func.now(), default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), default=func.now(), onupdate=func.now())
     
     # Relationship to job application
-    job_application = relationship("JobApplication", back_populates="follow_ups") 
\ No newline at end of file
+    job_application = relationship("JobApplication", back_populates="follow_ups")
+
+    # Covers the "follow-ups for one application ordered by date" query as a
+    # single index scan
+    __table_args__ = (
+        Index("ix_follow_ups_app_date", "job_application_id", "date"),
+    )
+
+    __mapper_args__ = {"eager_defaults": True} 
\ No newline at end of file
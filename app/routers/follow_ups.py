@@ -30,7 +30,6 @@ def create_follow_up(
     
     db.add(db_follow_up)
     db.commit()
-    db.refresh(db_follow_up)
     
     return db_follow_up
 
@@ -89,9 +88,8 @@ def update_follow_up(
     for field, value in update_data.items():
         setattr(db_follow_up, field, value)
     
-    db_follow_up.updated_at = datetime.utcnow()
+    # updated_at is maintained DB-side via onupdate=func.now()
     db.commit()
-    db.refresh(db_follow_up)
     
     return db_follow_up
 
@@ -1,24 +1,126 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, selectinload, raiseload
+from sqlalchemy import func, desc, tuple_
+from typing import List, Literal, Optional
 from datetime import datetime, timedelta
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
 import math
+import time
 
 from ..database import get_db
 from ..models import JobApplication
 from ..schemas import (
     JobApplicationCreate, JobApplicationUpdate, JobApplication as JobApplicationSchema, 
     JobApplicationList, JobApplicationWithFollowUps, ScrapingRequest, ScrapingResponse, SummaryStats,
-    JobDescriptionEnhanceRequest, JobDescriptionEnhanceResponse
+    BatchScrapingRequest, JobDescriptionEnhanceRequest, JobDescriptionEnhanceResponse
 )
-from ..ai_scraper import scrape_job_details_with_ai, enhance_job_description_with_ai
+from ..ai_scraper import ai_scraper, enhance_job_description_with_ai
 
 router = APIRouter()
 
 
+# Cap concurrent scrape/enhance requests so a surge can't exhaust outbound
+# sockets or the OpenAI rate limit; excess requests queue here instead
+_AI_CONCURRENCY = asyncio.Semaphore(10)
+
+# Sortable columns resolved once at import; avoids per-request hasattr/getattr
+# descriptor dispatch through the instrumented class and whitelists what
+# clients can order by
+SORTABLE = {
+    name: getattr(JobApplication, name)
+    for name in ("created_at", "updated_at", "date_applied", "date_job_posted",
+                 "company", "job_title", "application_status")
+}
+
+# Columns returned by summary-mode list queries: everything except the large
+# TEXT fields (job_description, notes, referral_notes), which dominate row
+# size but aren't needed to render a list
+_SUMMARY_COLUMNS = (
+    JobApplication.id,
+    JobApplication.job_title,
+    JobApplication.company,
+    JobApplication.location,
+    JobApplication.salary,
+    JobApplication.job_url,
+    JobApplication.date_applied,
+    JobApplication.date_job_posted,
+    JobApplication.application_status,
+    JobApplication.interview_stage,
+    JobApplication.referred_by,
+    JobApplication.referral_relationship,
+    JobApplication.referral_date,
+    JobApplication.created_at,
+    JobApplication.updated_at,
+)
+
+# Short-lived cache for pagination COUNT(*) results, keyed by the filter
+# combination; cleared on any write so totals never lag behind mutations
+# by more than one request
+_count_cache = {}
+_COUNT_CACHE_TTL = 30
+_COUNT_CACHE_MAX = 512
+
+# Dashboard stats cache: polling clients re-request this endpoint often and
+# the aggregates only need to be seconds-fresh; cleared on writes
+_stats_cache = {}
+_STATS_CACHE_TTL = 60
+
+
+def _cached_count(db: Session, query, key) -> int:
+    """Return the total row count for a filter combo, caching briefly."""
+    now = time.time()
+    entry = _count_cache.get(key)
+    if entry and entry[1] > now:
+        return entry[0]
+    total = query.with_entities(func.count(JobApplication.id)).scalar()
+    # Keys are client-supplied filter strings, so bound the cache: shed
+    # expired entries first, then oldest insertions if it is still full
+    if len(_count_cache) >= _COUNT_CACHE_MAX:
+        for stale in [k for k, (_, expires) in _count_cache.items() if expires <= now]:
+            _count_cache.pop(stale, None)
+        while len(_count_cache) >= _COUNT_CACHE_MAX:
+            _count_cache.pop(next(iter(_count_cache)))
+    _count_cache[key] = (total, now + _COUNT_CACHE_TTL)
+    return total
+
+
+def _collection_etag(db: Session, query) -> str:
+    """Derive a weak collection ETag from MAX(updated_at) and the row count."""
+    max_updated, count = query.with_entities(
+        func.max(JobApplication.updated_at), func.count(JobApplication.id)
+    ).one()
+    digest = hashlib.blake2b(f"{max_updated}|{count}".encode(), digest_size=8)
+    return f'"{digest.hexdigest()}"'
+
+
+def _encode_cursor(sort_value, row_id: int) -> str:
+    """Pack the last row's (sort value, id) into an opaque keyset cursor."""
+    payload = {"v": sort_value, "id": row_id}
+    if isinstance(sort_value, datetime):
+        # Tag datetimes explicitly so the decoder never guesses: a company
+        # or title that happens to look like a date must stay a string
+        payload["v"] = sort_value.isoformat()
+        payload["t"] = "dt"
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def _decode_cursor(cursor: str):
+    """Unpack a keyset cursor back into (sort value, id)."""
+    payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    value = payload["v"]
+    if payload.get("t") == "dt":
+        value = datetime.fromisoformat(value)
+    return value, payload["id"]
+
+
 @router.post("/job-applications", response_model=JobApplicationSchema)
-async def create_job_application(
+def create_job_application(
     application: JobApplicationCreate,
     db: Session = Depends(get_db)
 ):
@@ -27,27 +129,54 @@ async def create_job_application(
         db_application = JobApplication(**application.dict())
         db.add(db_application)
         db.commit()
-        db.refresh(db_application)
+        _count_cache.clear()
+        _stats_cache.clear()
         return db_application
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=f"Failed to create job application: {str(e)}")
 
 
-@router.get("/job-applications", response_model=JobApplicationList)
-async def get_job_applications(
+@router.post("/job-applications/bulk", response_model=List[JobApplicationSchema])
+def create_job_applications_bulk(
+    applications: List[JobApplicationCreate],
+    db: Session = Depends(get_db)
+):
+    """Create several job applications in one transaction."""
+    try:
+        db_applications = [JobApplication(**application.dict()) for application in applications]
+        db.add_all(db_applications)
+        # One commit for the whole batch: a single fsync instead of one per row
+        db.commit()
+        _count_cache.clear()
+        _stats_cache.clear()
+        return db_applications
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Failed to create job applications: {str(e)}")
+
+
+@router.get("/job-applications", response_model=JobApplicationList, response_model_exclude_none=True)
+def get_job_applications(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(10, ge=1, le=100, description="Number of records to return"),
     company: Optional[str] = Query(None, description="Filter by company name"),
     job_title: Optional[str] = Query(None, description="Filter by job title"),
     status: Optional[str] = Query(None, description="Filter by application status"),
-    sort_by: Optional[str] = Query("created_at", description="Sort by field"),
-    sort_order: Optional[str] = Query("desc", description="Sort order (asc/desc)"),
+    sort_by: Literal["created_at", "updated_at", "date_applied", "date_job_posted",
+                     "company", "job_title", "application_status"] = Query("created_at", description="Sort by field"),
+    sort_order: Literal["asc", "desc"] = Query("desc", description="Sort order (asc/desc)"),
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor from a previous page"),
+    summary: bool = Query(False, description="Skip large text fields for faster list rendering"),
+    request: Request = None,
+    response: Response = None,
     db: Session = Depends(get_db)
 ):
     """Get all job applications with filtering, sorting, and pagination."""
     try:
-        query = db.query(JobApplication)
+        # raiseload turns any accidental lazy relationship load during
+        # serialization into an immediate error instead of N hidden queries
+        query = db.query(JobApplication).options(raiseload("*"))
         
         # Apply filters
         if company:
@@ -57,21 +186,62 @@ async def get_job_applications(
         if status:
             query = query.filter(JobApplication.application_status == status)
         
-        # Apply sorting
-        if hasattr(JobApplication, sort_by):
-            sort_field = getattr(JobApplication, sort_by)
-            if sort_order.lower() == "desc":
-                query = query.order_by(desc(sort_field))
+        # Polling clients with an up-to-date page skip the query and
+        # serialization entirely: one tiny aggregate answers 304
+        etag = _collection_etag(db, query)
+        if request is not None and request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        if response is not None:
+            response.headers["ETag"] = etag
+        
+        # Get total count over the filters (cached briefly per filter combo;
+        # COUNT(*) dominates list-endpoint cost on large tables)
+        total = _cached_count(db, query, (company, job_title, status))
+        
+        # Sort column comes from the precomputed whitelist — FastAPI already
+        # rejected anything else via the Literal parameter. id is always the
+        # tiebreaker so the ordering is total and a keyset cursor identifies
+        # one exact position
+        sort_field = SORTABLE[sort_by]
+        descending = sort_order == "desc"
+        if descending:
+            query = query.order_by(desc(sort_field), desc(JobApplication.id))
+        else:
+            query = query.order_by(sort_field, JobApplication.id)
+        
+        # Summary mode projects the narrow columns instead of hydrating full
+        # ORM objects, leaving the TEXT fields out of the wire rows entirely
+        if summary:
+            query = query.with_entities(*_SUMMARY_COLUMNS)
+        
+        # Apply pagination: keyset seek when a cursor is given, otherwise
+        # legacy OFFSET/LIMIT so existing skip-based clients keep working
+        if cursor:
+            # Cursors are opaque client input; a garbled one is a 400, not a
+            # server error
+            try:
+                last_value, last_id = _decode_cursor(cursor)
+            except (ValueError, KeyError, TypeError, binascii.Error):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            position = tuple_(sort_field, JobApplication.id)
+            if descending:
+                query = query.filter(position < (last_value, last_id))
             else:
-                query = query.order_by(sort_field)
+                query = query.filter(position > (last_value, last_id))
+            applications = query.limit(limit).all()
         else:
-            query = query.order_by(desc(JobApplication.created_at))
+            applications = query.offset(skip).limit(limit).all()
         
-        # Get total count
-        total = query.count()
+        # Hand back a cursor whenever this page might have a successor
+        next_cursor = None
+        if len(applications) == limit:
+            last = applications[-1]
+            next_cursor = _encode_cursor(getattr(last, sort_by), last.id)
         
-        # Apply pagination
-        applications = query.offset(skip).limit(limit).all()
+        if summary:
+            # Row tuples -> schema objects; omitted TEXT fields default to
+            # None, and rows straight from the DB skip re-validation
+            applications = [JobApplicationSchema.from_row_fast(row) for row in applications]
         
         # Calculate pagination info
         pages = math.ceil(total / limit) if total > 0 else 0
@@ -81,49 +251,93 @@ async def get_job_applications(
             total=total,
             page=skip // limit + 1,
             size=limit,
-            pages=pages
+            pages=pages,
+            next_cursor=next_cursor
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch job applications: {str(e)}")
 
 
+@router.get("/job-applications/export")
+def export_job_applications(db: Session = Depends(get_db)):
+    """Stream every job application as NDJSON without buffering the table."""
+    def generate():
+        # yield_per streams rows from the DB in batches, so peak memory is
+        # one batch rather than the whole table, and the first line reaches
+        # the client at first-row latency
+        for row in db.query(JobApplication).options(raiseload("*")).yield_per(200):
+            yield JobApplicationSchema.from_row_fast(row).json() + "\n"
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @router.get("/job-applications/stats", response_model=SummaryStats)
-async def get_application_stats(db: Session = Depends(get_db)):
+def get_application_stats(
+    request: Request = None,
+    response: Response = None,
+    db: Session = Depends(get_db)
+):
     """Get summary statistics for job applications."""
     try:
-        # Total applications
-        total_applications = db.query(JobApplication).count()
+        etag = _collection_etag(db, db.query(JobApplication))
+        if request is not None and request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        if response is not None:
+            response.headers["ETag"] = etag
         
-        # Recent applications (last 30 days)
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        recent_applications = db.query(JobApplication).filter(
-            JobApplication.created_at >= thirty_days_ago
-        ).count()
+        cached = _stats_cache.get('stats')
+        if cached and cached[1] > time.time():
+            return cached[0]
         
-        # Status breakdown
-        status_breakdown = db.query(
+        # One timestamp for the whole request
+        now = datetime.now()
+        thirty_days_ago = now - timedelta(days=30)
+        
+        # Status breakdown, total and recent count in one grouped scan:
+        # SUM(COUNT(...)) OVER () carries the grand totals on every group row
+        per_status_count = func.count(JobApplication.id)
+        recent_count = func.count(JobApplication.id).filter(
+            JobApplication.created_at >= thirty_days_ago
+        )
+        rows = db.query(
             JobApplication.application_status,
-            func.count(JobApplication.id)
+            per_status_count.label("count"),
+            func.sum(per_status_count).over().label("total"),
+            func.sum(recent_count).over().label("recent")
         ).group_by(JobApplication.application_status).all()
         
-        status_dict = {status: count for status, count in status_breakdown}
+        total_applications = rows[0].total if rows else 0
+        recent_applications = (rows[0].recent or 0) if rows else 0
+        status_dict = {row.application_status: row.count for row in rows}
+        
+        # Top companies by application count, ordered and limited in SQL
+        top_rows = db.query(
+            JobApplication.company,
+            func.count(JobApplication.id).label("count")
+        ).group_by(JobApplication.company).order_by(desc("count")).limit(5).all()
+        top_companies = {company: count for company, count in top_rows}
         
         # Calculate success rate (offers / total applications)
         offers = status_dict.get('Offer', 0)
         success_rate = offers / total_applications if total_applications > 0 else 0
         
-        return SummaryStats(
+        stats = SummaryStats(
             total_applications=total_applications,
             status_breakdown=status_dict,
             recent_applications=recent_applications,
-            success_rate=success_rate
+            success_rate=success_rate,
+            top_companies=top_companies
         )
+        _stats_cache['stats'] = (stats, time.time() + _STATS_CACHE_TTL)
+        return stats
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch statistics: {str(e)}")
 
 
 @router.get("/job-applications/{application_id}", response_model=JobApplicationSchema)
-async def get_job_application(application_id: int, db: Session = Depends(get_db)):
+def get_job_application(application_id: int, db: Session = Depends(get_db)):
     """Get a specific job application by ID."""
     try:
         application = db.query(JobApplication).filter(JobApplication.id == application_id).first()
@@ -137,10 +351,15 @@ async def get_job_application(application_id: int, db: Session = Depends(get_db)
 
 
 @router.get("/job-applications/{application_id}/with-follow-ups", response_model=JobApplicationWithFollowUps)
-async def get_job_application_with_follow_ups(application_id: int, db: Session = Depends(get_db)):
+def get_job_application_with_follow_ups(application_id: int, db: Session = Depends(get_db)):
     """Get a specific job application by ID with all its follow-ups."""
     try:
-        application = db.query(JobApplication).filter(JobApplication.id == application_id).first()
+        # Eager-load follow-ups so serialization doesn't fire a lazy SELECT;
+        # raiseload makes any other relationship access fail loudly
+        application = db.query(JobApplication).options(
+            selectinload(JobApplication.follow_ups),
+            raiseload("*")
+        ).filter(JobApplication.id == application_id).first()
         if not application:
             raise HTTPException(status_code=404, detail="Job application not found")
         return application
@@ -149,7 +368,7 @@ async def get_job_application_with_follow_ups(application_id: int, db: Session =
 
 
 @router.put("/job-applications/{application_id}", response_model=JobApplicationSchema)
-async def update_job_application(
+def update_job_application(
     application_id: int,
     application_update: JobApplicationUpdate,
     db: Session = Depends(get_db)
@@ -165,9 +384,10 @@ async def update_job_application(
         for field, value in update_data.items():
             setattr(db_application, field, value)
         
-        db_application.updated_at = datetime.now()
+        # updated_at is maintained DB-side via onupdate=func.now()
         db.commit()
-        db.refresh(db_application)
+        _count_cache.clear()
+        _stats_cache.clear()
         return db_application
     except HTTPException:
         raise
@@ -177,7 +397,7 @@ async def update_job_application(
 
 
 @router.delete("/job-applications/{application_id}")
-async def delete_job_application(application_id: int, db: Session = Depends(get_db)):
+def delete_job_application(application_id: int, db: Session = Depends(get_db)):
     """Delete a job application."""
     try:
         db_application = db.query(JobApplication).filter(JobApplication.id == application_id).first()
@@ -186,6 +406,8 @@ async def delete_job_application(application_id: int, db: Session = Depends(get_
         
         db.delete(db_application)
         db.commit()
+        _count_cache.clear()
+        _stats_cache.clear()
         return {"message": "Job application deleted successfully"}
     except HTTPException:
         raise
@@ -194,38 +416,53 @@ async def delete_job_application(application_id: int, db: Session = Depends(get_
         raise HTTPException(status_code=400, detail=f"Failed to delete job application: {str(e)}")
 
 
-@router.post("/scrape-job", response_model=ScrapingResponse)
+@router.post("/scrape-job", response_model=ScrapingResponse, response_model_exclude_none=True)
 async def scrape_job_details(scraping_request: ScrapingRequest):
     """Scrape job details from a URL using AI."""
     try:
-        scraped_data = scrape_job_details_with_ai(scraping_request.url)
+        # Fully async path: pooled aiohttp fetch + AsyncOpenAI extraction,
+        # so the scrape never occupies the event loop or a worker thread
+        async with _AI_CONCURRENCY:
+            scraped_data = await ai_scraper.scrape_job_details_async(scraping_request.url)
         
+        # Plain dicts here: the response_model already validates the payload
+        # once on the way out, so building ScrapingResponse/ScrapedJobData
+        # instances first would just validate everything twice
         if scraped_data.get('success'):
-            return ScrapingResponse(
-                success=True,
-                data=scraped_data
-            )
+            return {"success": True, "data": scraped_data}
         else:
-            return ScrapingResponse(
-                success=False,
-                error=scraped_data.get('error', 'Unknown scraping error')
-            )
+            return {"success": False, "error": scraped_data.get('error', 'Unknown scraping error')}
     except Exception as e:
-        return ScrapingResponse(
-            success=False,
-            error=f"Scraping failed: {str(e)}"
-        )
+        return {"success": False, "error": f"Scraping failed: {str(e)}"}
+
+
+@router.post("/scrape-jobs/batch", response_model=List[ScrapingResponse], response_model_exclude_none=True)
+async def scrape_jobs_batch(batch_request: BatchScrapingRequest):
+    """Scrape several job posting URLs concurrently."""
+    # The shared semaphore caps this batch's fetches and AI calls under the
+    # same budget as the single-URL endpoints, while scrape_many packs the
+    # postings that need extraction into shared completions
+    results = await ai_scraper.scrape_many(batch_request.urls, semaphore=_AI_CONCURRENCY)
+    return [
+        {"success": True, "data": result}
+        if result.get('success')
+        else {"success": False, "error": result.get('error', 'Unknown scraping error')}
+        for result in results
+    ]
 
 
 @router.post("/enhance-job-description", response_model=JobDescriptionEnhanceResponse)
 async def enhance_job_description(enhance_request: JobDescriptionEnhanceRequest):
     """Enhance a job description using AI to extract key information."""
     try:
-        enhanced_data = enhance_job_description_with_ai(
-            enhance_request.job_description,
-            enhance_request.job_title,
-            enhance_request.company
-        )
+        # Same as /scrape-job: keep the multi-second OpenAI call off the loop
+        async with _AI_CONCURRENCY:
+            enhanced_data = await run_in_threadpool(
+                enhance_job_description_with_ai,
+                enhance_request.job_description,
+                enhance_request.job_title,
+                enhance_request.company
+            )
         
         if enhanced_data.get('success'):
             return JobDescriptionEnhanceResponse(
@@ -1,7 +1,29 @@
-from pydantic import BaseModel, validator
-from typing import Optional, List
+from pydantic import BaseModel
+from typing import Optional, List, Literal
 from datetime import datetime
 
+# Closed value sets expressed as Literal types: pydantic validates membership
+# directly (and documents the values in OpenAPI) with no validator callback
+# per instantiation. The frozensets back O(1) checks outside the schemas.
+ApplicationStatus = Literal[
+    "Applied", "Interviewing", "Offer", "Rejected", "Withdrawn", "Pending"
+]
+InterviewStage = Literal[
+    "None", "Phone Screen", "Technical Interview", "Behavioral Interview",
+    "System Design", "Coding Challenge", "Onsite", "Final Round"
+]
+FollowUpType = Literal[
+    "Phone Call", "Email", "Interview", "Follow-up", "Technical Interview",
+    "Behavioral Interview", "System Design", "Coding Challenge", "Onsite",
+    "Final Round", "Reference Check", "Background Check", "Offer Discussion"
+]
+FollowUpStatus = Literal["Pending", "Completed", "Cancelled", "Rescheduled"]
+
+VALID_APPLICATION_STATUSES = frozenset(ApplicationStatus.__args__)
+VALID_INTERVIEW_STAGES = frozenset(InterviewStage.__args__)
+VALID_FOLLOW_UP_TYPES = frozenset(FollowUpType.__args__)
+VALID_FOLLOW_UP_STATUSES = frozenset(FollowUpStatus.__args__)
+
 
 # Base schema for job applications
 class JobApplicationBase(BaseModel):
@@ -13,8 +35,8 @@ class JobApplicationBase(BaseModel):
     job_url: Optional[str] = None
     date_applied: datetime
     date_job_posted: Optional[datetime] = None
-    application_status: str = "Applied"
-    interview_stage: str = "None"
+    application_status: ApplicationStatus = "Applied"
+    interview_stage: InterviewStage = "None"
     notes: Optional[str] = None
     # Referral information
     referred_by: Optional[str] = None
@@ -22,25 +44,6 @@ class JobApplicationBase(BaseModel):
     referral_date: Optional[datetime] = None
     referral_notes: Optional[str] = None
 
-    @validator('application_status')
-    def validate_application_status(cls, v):
-        valid_statuses = [
-            "Applied", "Interviewing", "Offer", "Rejected", "Withdrawn", "Pending"
-        ]
-        if v not in valid_statuses:
-            raise ValueError(f'Application status must be one of: {", ".join(valid_statuses)}')
-        return v
-
-    @validator('interview_stage')
-    def validate_interview_stage(cls, v):
-        valid_stages = [
-            "None", "Phone Screen", "Technical Interview", "Behavioral Interview", 
-            "System Design", "Coding Challenge", "Onsite", "Final Round"
-        ]
-        if v not in valid_stages:
-            raise ValueError(f'Interview stage must be one of: {", ".join(valid_stages)}')
-        return v
-
 
 # Schema for creating a new job application
 class JobApplicationCreate(JobApplicationBase):
@@ -74,7 +77,14 @@ class JobApplication(JobApplicationBase):
     updated_at: datetime
 
     class Config:
-        from_attributes = True
+        orm_mode = True
+
+    @classmethod
+    def from_row_fast(cls, row) -> "JobApplication":
+        """Build from a trusted DB row, skipping validation via construct()."""
+        return cls.construct(
+            **{name: getattr(row, name, None) for name in cls.__fields__}
+        )
 
 
 # Schema for list of job applications
@@ -84,6 +94,7 @@ class JobApplicationList(BaseModel):
     page: int
     size: int
     pages: int
+    next_cursor: Optional[str] = None
 
 
 # Schema for scraped job data
@@ -105,6 +116,11 @@ class ScrapingRequest(BaseModel):
     url: str
 
 
+# Schema for batch scraping request
+class BatchScrapingRequest(BaseModel):
+    urls: List[str]
+
+
 # Schema for scraping response
 class ScrapingResponse(BaseModel):
     success: bool
@@ -118,36 +134,19 @@ class SummaryStats(BaseModel):
     status_breakdown: dict
     recent_applications: int
     success_rate: float
+    top_companies: Optional[dict] = None
 
 
 # Base schema for follow-ups
 class FollowUpBase(BaseModel):
-    follow_up_type: str
+    follow_up_type: FollowUpType
     title: str
     description: Optional[str] = None
     date: datetime
-    status: str = "Pending"
+    status: FollowUpStatus = "Pending"
     outcome: Optional[str] = None
     notes: Optional[str] = None
 
-    @validator('follow_up_type')
-    def validate_follow_up_type(cls, v):
-        valid_types = [
-            "Phone Call", "Email", "Interview", "Follow-up", "Technical Interview", 
-            "Behavioral Interview", "System Design", "Coding Challenge", "Onsite", 
-            "Final Round", "Reference Check", "Background Check", "Offer Discussion"
-        ]
-        if v not in valid_types:
-            raise ValueError(f'Follow-up type must be one of: {", ".join(valid_types)}')
-        return v
-
-    @validator('status')
-    def validate_status(cls, v):
-        valid_statuses = ["Pending", "Completed", "Cancelled", "Rescheduled"]
-        if v not in valid_statuses:
-            raise ValueError(f'Status must be one of: {", ".join(valid_statuses)}')
-        return v
-
 
 # Schema for creating a new follow-up
 class FollowUpCreate(FollowUpBase):
@@ -173,7 +172,14 @@ class FollowUp(FollowUpBase):
     updated_at: datetime
 
     class Config:
-        from_attributes = True
+        orm_mode = True
+
+    @classmethod
+    def from_row_fast(cls, row) -> "FollowUp":
+        """Build from a trusted DB row, skipping validation via construct()."""
+        return cls.construct(
+            **{name: getattr(row, name, None) for name in cls.__fields__}
+        )
 
 
 # Schema for job application with follow-ups
@@ -181,7 +187,7 @@ class JobApplicationWithFollowUps(JobApplication):
     follow_ups: List[FollowUp] = []
 
     class Config:
-        from_attributes = True 
+        orm_mode = True 
 
 # Schema for job description enhancement
 class JobDescriptionEnhanceRequest(BaseModel):
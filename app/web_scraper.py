@@ -5,18 +5,55 @@ This module provides functionality to scrape job details from various job postin
 It supports multiple scraping strategies and handles different job board formats.
 """
 
+import asyncio
+import hashlib
+from functools import lru_cache
+import json
 import re
 import logging
 from typing import Optional, Dict, Any, List
 from urllib.parse import urlparse
 import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
+import soupsieve
+from bs4 import BeautifulSoup, NavigableString
+from datetime import datetime, timezone
+
+from .scrape_cache import scrape_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Parsed results are cached on disk; job postings rarely change over a day
+RESULT_CACHE_TTL = 24 * 3600
+
+# Job-relevant content sits early in the page; stop downloading (and parsing)
+# past this point rather than buffering multi-MB script payloads
+MAX_FETCH_SIZE = 512_000
+FETCH_CHUNK_SIZE = 64 * 1024
+
+
+@lru_cache(maxsize=256)
+def _board_for_netloc(netloc: str, domains: tuple) -> Optional[str]:
+    """Resolve a hostname to a known job board name by domain suffix."""
+    for domain, board in domains:
+        if netloc == domain or netloc.endswith('.' + domain):
+            return board
+    return None
+
+
+def _result_cache_key(url: str) -> str:
+    """Cache key for a parsed scrape result."""
+    return 'webscrape:' + hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+
+# Prefer the C-backed lxml parser; html.parser keeps things working when
+# lxml is missing, just slower
+try:
+    import lxml  # noqa: F401
+    _BS_PARSER = 'lxml'
+except ImportError:
+    _BS_PARSER = 'html.parser'
+
 
 class JobScraper:
     """
@@ -72,13 +109,44 @@ class JobScraper:
                 }
             }
         }
+        
+        # Compile every CSS selector and text pattern once here instead of
+        # re-parsing them on each scrape
+        for board_info in self.job_boards.values():
+            board_info['selectors'] = {
+                field: [soupsieve.compile(s) for s in selector_list]
+                for field, selector_list in board_info['selectors'].items()
+            }
+        self._company_re = re.compile(
+            r'\b(?:company|employer|organization|corporation|inc|llc|ltd|corp)\b',
+            re.IGNORECASE
+        )
+        self._location_re = re.compile(
+            r'\b(?:location|address|city|state|country|remote|hybrid|onsite)\b',
+            re.IGNORECASE
+        )
+        # Immutable (domain, board) pairs so _board_for_netloc can memoize
+        self._board_domains = tuple(
+            (board_info['domain'], board_name)
+            for board_name, board_info in self.job_boards.items()
+        )
+        self._description_selectors = [
+            soupsieve.compile(s) for s in (
+                'div[class*="description"]',
+                'div[class*="content"]',
+                'div[class*="details"]',
+                'section[class*="description"]',
+                'article[class*="description"]',
+            )
+        ]
     
-    def scrape_job_details(self, url: str) -> Dict[str, Any]:
+    def scrape_job_details(self, url: str, refresh: bool = False) -> Dict[str, Any]:
         """
         Main method to scrape job details from a URL.
         
         Args:
             url (str): The job posting URL
+            refresh (bool): Bypass the cache and fetch fresh content
             
         Returns:
             Dict[str, Any]: Scraped job details or error information
@@ -92,12 +160,22 @@ class JobScraper:
                     'url': url
                 }
             
+            # Repeat lookups for the same URL short-circuit to the cached result
+            cache_key = _result_cache_key(url)
+            if not refresh:
+                cached = scrape_cache.get(cache_key)
+                if cached:
+                    return json.loads(cached)
+            
             # Determine job board type
             job_board = self._identify_job_board(url)
             
             # Try scraping with requests + BeautifulSoup
             scraped_data = self._scrape_with_requests(url, job_board)
             
+            if scraped_data.get('success'):
+                scrape_cache.set(cache_key, json.dumps(scraped_data), RESULT_CACHE_TTL)
+            
             return scraped_data
             
         except Exception as e:
@@ -119,28 +197,29 @@ class JobScraper:
     def _identify_job_board(self, url: str) -> Optional[str]:
         """Identify the job board from the URL."""
         domain = urlparse(url).netloc.lower()
-        
-        for board_name, board_info in self.job_boards.items():
-            if board_info['domain'] in domain:
-                return board_name
-        
-        return None
+        return _board_for_netloc(domain, self._board_domains)
     
     def _scrape_with_requests(self, url: str, job_board: Optional[str]) -> Dict[str, Any]:
         """Scrape using requests and BeautifulSoup."""
         try:
             logger.info(f"Attempting to scrape with requests: {url}")
             
-            response = self.session.get(url, timeout=15)
+            response = self.session.get(url, timeout=15, stream=True)
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract data based on job board
-            if job_board and job_board in self.job_boards:
-                return self._extract_with_selectors(soup, job_board, url)
-            else:
-                return self._extract_generic(soup, url)
+
+            # Read in chunks and cap the download instead of buffering the
+            # whole page; everything we extract lives well before the cap
+            chunks = []
+            total = 0
+            for chunk in response.iter_content(FETCH_CHUNK_SIZE):
+                chunks.append(chunk)
+                total += len(chunk)
+                if total > MAX_FETCH_SIZE:
+                    logger.debug(f"Truncating download at {total} bytes for {url}")
+                    break
+            response.close()
+
+            return self._parse_content(b''.join(chunks), job_board, url)
                 
         except requests.RequestException as e:
             logger.warning(f"Requests scraping failed for {url}: {str(e)}")
@@ -149,14 +228,106 @@ class JobScraper:
             logger.warning(f"BeautifulSoup parsing failed for {url}: {str(e)}")
             return {'success': False, 'error': f'Parsing failed: {str(e)}', 'url': url}
     
-    def _extract_with_selectors(self, soup: BeautifulSoup, job_board: str, url: str) -> Dict[str, Any]:
+    def _parse_content(self, content: bytes, job_board: Optional[str], url: str) -> Dict[str, Any]:
+        """Parse fetched HTML and dispatch to the right extraction strategy."""
+        soup = BeautifulSoup(content, _BS_PARSER)
+        
+        # One timestamp per scrape, shared by whichever extractor runs
+        scraped_at = datetime.now(timezone.utc).isoformat()
+        
+        # Extract data based on job board
+        if job_board and job_board in self.job_boards:
+            return self._extract_with_selectors(soup, job_board, url, scraped_at)
+        else:
+            return self._extract_generic(soup, url, scraped_at)
+
+    async def scrape_job_details_async(self, url: str, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Async variant of scrape_job_details.
+        
+        Fetches over a shared pooled aiohttp session and parses off the event
+        loop, so a batch of URLs overlaps its network waits.
+        
+        Args:
+            url (str): The job posting URL
+            refresh (bool): Bypass the cache and fetch fresh content
+            
+        Returns:
+            Dict[str, Any]: Scraped job details or error information
+        """
+        try:
+            if not self._is_valid_url(url):
+                return {
+                    'success': False,
+                    'error': 'Invalid URL format',
+                    'url': url
+                }
+            
+            cache_key = _result_cache_key(url)
+            if not refresh:
+                cached = scrape_cache.get(cache_key)
+                if cached:
+                    return json.loads(cached)
+            
+            job_board = self._identify_job_board(url)
+            
+            session = await _session()
+            import aiohttp
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                response.raise_for_status()
+                chunks = []
+                total = 0
+                async for chunk in response.content.iter_chunked(FETCH_CHUNK_SIZE):
+                    chunks.append(chunk)
+                    total += len(chunk)
+                    if total > MAX_FETCH_SIZE:
+                        logger.debug(f"Truncating download at {total} bytes for {url}")
+                        break
+                content = b''.join(chunks)
+            
+            # Parsing is CPU-bound; keep it off the event loop
+            scraped_data = await asyncio.to_thread(self._parse_content, content, job_board, url)
+            
+            if scraped_data.get('success'):
+                scrape_cache.set(cache_key, json.dumps(scraped_data), RESULT_CACHE_TTL)
+            
+            return scraped_data
+            
+        except Exception as e:
+            logger.error(f"Error scraping job details from {url}: {str(e)}")
+            return {
+                'success': False,
+                'error': f'Scraping failed: {str(e)}',
+                'url': url
+            }
+
+    async def scrape_many(self, urls: List[str], concurrency: int = 20) -> List[Dict[str, Any]]:
+        """
+        Scrape several job posting URLs concurrently.
+        
+        Args:
+            urls (List[str]): The job posting URLs
+            concurrency (int): Cap on simultaneously in-flight scrapes
+            
+        Returns:
+            List[Dict[str, Any]]: One result dict per URL, in the same order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def bounded(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.scrape_job_details_async(url)
+        
+        return await asyncio.gather(*(bounded(url) for url in urls))
+
+    def _extract_with_selectors(self, soup: BeautifulSoup, job_board: str, url: str, scraped_at: str) -> Dict[str, Any]:
         """Extract job details using predefined selectors for known job boards."""
         selectors = self.job_boards[job_board]['selectors']
         extracted_data = {
             'success': True,
             'url': url,
             'job_board': job_board,
-            'scraped_at': datetime.now().isoformat()
+            'scraped_at': scraped_at
         }
         
         # Extract job title
@@ -191,13 +362,13 @@ class JobScraper:
         
         return extracted_data
     
-    def _extract_generic(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
+    def _extract_generic(self, soup: BeautifulSoup, url: str, scraped_at: str) -> Dict[str, Any]:
         """Generic extraction for unknown job boards."""
         extracted_data = {
             'success': True,
             'url': url,
             'job_board': 'generic',
-            'scraped_at': datetime.now().isoformat()
+            'scraped_at': scraped_at
         }
         
         # Try to find job title in h1 tags
@@ -208,53 +379,30 @@ class JobScraper:
                 extracted_data['job_title'] = text
                 break
         
-        # Try to find company name in common patterns
-        company_patterns = [
-            'company', 'employer', 'organization', 'corporation',
-            'inc', 'llc', 'ltd', 'corp', 'company'
-        ]
-        
-        for pattern in company_patterns:
-            elements = soup.find_all(text=re.compile(pattern, re.IGNORECASE))
-            for element in elements:
-                parent = element.parent
+        # Find company and location hints in a single pass over the tree's
+        # text nodes instead of one full find_all traversal per keyword
+        for node in soup.descendants:
+            if not isinstance(node, NavigableString):
+                continue
+            value = str(node)
+            if 'company' not in extracted_data and self._company_re.search(value):
+                parent = node.parent
                 if parent:
                     text = parent.get_text(strip=True)
                     if text and len(text) > 2 and len(text) < 100:
                         extracted_data['company'] = text
-                        break
-            if extracted_data.get('company'):
-                break
-        
-        # Try to find location
-        location_patterns = [
-            'location', 'address', 'city', 'state', 'country',
-            'remote', 'hybrid', 'onsite'
-        ]
-        
-        for pattern in location_patterns:
-            elements = soup.find_all(text=re.compile(pattern, re.IGNORECASE))
-            for element in elements:
-                parent = element.parent
+            if 'location' not in extracted_data and self._location_re.search(value):
+                parent = node.parent
                 if parent:
                     text = parent.get_text(strip=True)
                     if text and len(text) > 2 and len(text) < 100:
                         extracted_data['location'] = text
-                        break
-            if extracted_data.get('location'):
+            if 'company' in extracted_data and 'location' in extracted_data:
                 break
         
         # Try to find job description
-        description_selectors = [
-            'div[class*="description"]',
-            'div[class*="content"]',
-            'div[class*="details"]',
-            'section[class*="description"]',
-            'article[class*="description"]'
-        ]
-        
-        for selector in description_selectors:
-            elements = soup.select(selector)
+        for selector in self._description_selectors:
+            elements = selector.select(soup)
             for element in elements:
                 text = element.get_text(strip=True)
                 if text and len(text) > 100:
@@ -271,23 +419,45 @@ class JobScraper:
         return extracted_data
     
     def _extract_text_with_selectors(self, soup: BeautifulSoup, selectors: List[str]) -> Optional[str]:
-        """Extract text using multiple selectors."""
+        """Extract text using multiple selectors, stopping at the first hit."""
         for selector in selectors:
             try:
-                elements = soup.select(selector)
-                for element in elements:
+                # iselect is lazy, so the tree walk stops as soon as a
+                # matching element with text turns up instead of collecting
+                # every match first
+                for element in selector.iselect(soup):
                     text = element.get_text(strip=True)
                     if text:
                         return text
             except Exception as e:
                 logger.debug(f"Selector {selector} failed: {str(e)}")
                 continue
-        
+
         return None
 
 
-# Create a global scraper instance
-job_scraper = JobScraper()
+# Shared aiohttp session for the async path, created lazily on first use so
+# importing this module doesn't require a running event loop
+_aiohttp_session = None
+
+
+async def _session():
+    global _aiohttp_session
+    if _aiohttp_session is None or _aiohttp_session.closed:
+        import aiohttp
+        _aiohttp_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=50, limit_per_host=4),
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            }
+        )
+    return _aiohttp_session
+
+
+@lru_cache(maxsize=None)
+def get_scraper() -> JobScraper:
+    """Shared JobScraper, built lazily so importing this module stays cheap."""
+    return JobScraper()
 
 
 def scrape_job_details_from_url(url: str) -> Dict[str, Any]:
@@ -300,4 +470,4 @@ def scrape_job_details_from_url(url: str) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Scraped job details or error information
     """
-    return job_scraper.scrape_job_details(url) 
\ No newline at end of file
+    return get_scraper().scrape_job_details(url) 
\ No newline at end of file
@@ -1,29 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
 from app.routers import job_applications, follow_ups
 from app.models import Base
 from app.database import engine
 import logging
+import os
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create database tables with error handling
-try:
-    logger.info("Attempting to connect to database and create tables...")
-    Base.metadata.create_all(bind=engine)
-    logger.info("✅ Database tables created successfully!")
-except Exception as e:
-    logger.error(f"❌ Failed to create database tables: {e}")
-    logger.error("Please check your database connection and try again.")
-    logger.error("You can test the connection by running: python test_connection.py")
-    # Don't exit - let the app start anyway so we can debug
-
 app = FastAPI(
     title="Job Application Tracker API",
     description="A comprehensive API for tracking job applications with web scraping capabilities",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse  # Rust-backed serializer, native datetime handling
 )
 
 # Configure CORS
@@ -35,6 +28,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def create_tables():
+    """Create database tables on startup (skippable where migrations own DDL)."""
+    # Importing main no longer touches the database; set CREATE_TABLES=0 in
+    # deployments where a migration tool manages the schema
+    if os.getenv("CREATE_TABLES", "1") != "1":
+        logger.info("CREATE_TABLES disabled; skipping schema creation")
+        return
+    try:
+        logger.info("Attempting to connect to database and create tables...")
+        if engine.dialect.name == "postgresql":
+            # The trigram indexes on company/job_title need the pg_trgm extension
+            with engine.connect() as connection:
+                connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                connection.commit()
+        Base.metadata.create_all(bind=engine)
+        logger.info("✅ Database tables created successfully!")
+    except Exception as e:
+        logger.error(f"❌ Failed to create database tables: {e}")
+        logger.error("Please check your database connection and try again.")
+        logger.error("You can test the connection by running: python test_connection.py")
+        # Don't exit - let the app start anyway so we can debug
+
+
 # Include routers
 app.include_router(job_applications.router, prefix="/api/v1", tags=["job-applications"])
 app.include_router(follow_ups.router, prefix="/api/v1", tags=["follow-ups"])
@@ -48,15 +65,12 @@ async def health_check():
     return {"status": "healthy"}
 
 @app.get("/db-status")
-async def database_status():
+def database_status():
     """Check database connection status"""
     try:
-        # Try a simple query
-        from app.database import SessionLocal
-        from sqlalchemy import text
-        db = SessionLocal()
-        db.execute(text("SELECT 1"))
-        db.close()
+        # Borrow a pooled connection directly; no ORM session needed for a ping
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
         return {"database": "connected", "status": "healthy"}
     except Exception as e:
         return {"database": "disconnected", "status": "error", "error": str(e)} 
\ No newline at end of file